@@ -31,9 +31,24 @@
 #########################################################
 
 import numpy as np;
-import matplotlib.pyplot as plt;
 import time;
+import contextlib;
 import os;
+import sys;
+import json;
+import tempfile;
+import shutil;
+import multiprocessing;
+import itertools;
+import hashlib;
+
+def Pyplot_Import():
+    #matplotlib is imported when the first graph is made, so the simulations do not need it. Without a display, the non-interactive 'Agg' backend is used and the graphs can still be saved.
+    import matplotlib;
+    if not "matplotlib.pyplot" in sys.modules and not "MPLBACKEND" in os.environ and sys.platform.startswith("linux") and not os.environ.get("DISPLAY") and not os.environ.get("WAYLAND_DISPLAY"):
+        matplotlib.use("Agg");
+    import matplotlib.pyplot as plt;
+    return plt;
 
 def List_Generate(pronunciation_File="Pronunciation_Data.txt"):
     word_List = [];
@@ -56,19 +71,44 @@ def List_Generate(pronunciation_File="Pronunciation_Data.txt"):
     return list(phoneme_Set), word_List;
 
 class TISK_Model:
-    def __init__(self, phoneme_List, word_List, time_Slots = None, nPhone_Threshold = None):
+    def __init__(self, phoneme_List, word_List, time_Slots = None, nPhone_Threshold = None, sparse_Weight = False, dtype = np.float64, prune_Diphone = False, factorized_Diphone = False):
         #Assign Label
         self.phoneme_List = phoneme_List;
-        self.diphone_List = [];
-        for first_Diphone in phoneme_List:
-            for second_Diphone in phoneme_List:
-                self.diphone_List.append(first_Diphone + second_Diphone);
+        #With 'prune_Diphone', the diphone layer has only the open diphones of the words. The other diphones are not connected to any word, so the word activations do not change.
+        self.prune_Diphone = prune_Diphone;
+        if self.prune_Diphone:
+            self.diphone_List = self.Attested_Diphone_List(word_List);
+        else:
+            self.diphone_List = [];
+            for first_Diphone in phoneme_List:
+                for second_Diphone in phoneme_List:
+                    self.diphone_List.append(first_Diphone + second_Diphone);
         self.single_Phone_List = phoneme_List.copy();
         self.word_List = word_List;
+        self.phoneme_Index_Dict = {phoneme: index for index, phoneme in enumerate(self.phoneme_List)};
+        self.diphone_Index_Dict = {diphone: index for index, diphone in enumerate(self.diphone_List)};
+        self.word_Index_Dict = {};
+        for index, word in enumerate(self.word_List):
+            self.word_Index_Dict.setdefault(word, index);   #Same to 'self.word_List.index()'
 
         self.phoneme_Amount = len(self.phoneme_List);
         self.diphone_Amount = len(self.diphone_List);
         self.word_Amount = len(self.word_List);
+        self.category_Index_Dict = None;    #Made by 'Category_Index_Build' when the categories are used first.
+
+        #The word side connections (Diphone -> Word, Single phone -> Word, Word -> Word, and feedback) are mostly zero. With 'sparse_Weight', they are stored as scipy CSR matrices.
+        self.sparse_Weight = sparse_Weight;
+        if self.sparse_Weight:
+            try:
+                import scipy.sparse;
+            except ImportError:
+                raise Exception("'sparse_Weight' requires scipy. Install scipy or construct the model with 'sparse_Weight = False'.");
+
+        #With 'factorized_Diphone', the Phoneme -> Diphone input is computed from the slot sums of each phoneme ('Diphone_Input_Generate'), and the '(phonemes * time slots, diphones)' matrix is never made.
+        self.factorized_Diphone = factorized_Diphone;
+
+        #The floating point type of weights and activations. Activations are clipped to [0, 1], so 'numpy.float32' halves the memory with small deviation (see README).
+        self.dtype = np.dtype(dtype);
 
         self.parameter_Dict = {};
         self.parameter_Dict["iStep"] = 10;
@@ -85,6 +125,10 @@ class TISK_Model:
         else:
             self.parameter_Dict["nPhone_Threshold"] = nPhone_Threshold;
 
+        self.initialized = False;
+        self.profiler = None;   #Assigned by 'Profiler_Assign'
+        self.word_Buffer_Dict = {};     #The buffers with spare words, which 'Add_Words' fills. The word side arrays are views of them.
+        self.feature_Word_Index_Dict = None;    #Made by 'Feature_Word_Index_Generate' when a word is added first, and kept by 'Add_Words' and 'Remove_Words'.
         self.Decay_Parameter_Assign(0.001, 0.001, 0.001, 0.01);
         self.Weight_Parameter_Assign(1.0, 0.1, 0.05, 0.01, -0.005);
         self.Feedback_Parameter_Assign(0.0, 0.0, 0.0, 0.0);
@@ -111,7 +155,13 @@ class TISK_Model:
         if word_to_Word_Weight is not None:
             self.parameter_Dict[("Weight", "Word_to_Word")] = word_to_Word_Weight;
 
-        self.initialized = False;
+        if self.initialized:    #The connection structures are kept, so only the changed connections are rescaled.
+            if phoneme_to_Phone_Weight is not None:
+                self.Phoneme_Weight_Generate();
+            if diphone_to_Word_Weight is not None or sPhone_to_Word_Weight is not None:
+                self.Word_Weight_Generate();
+            if word_to_Word_Weight is not None:
+                self.Word_to_Word_Weight_Generate();
 
         if self.parameter_Dict[("Weight", "Phoneme_to_Phone")] * self.parameter_Dict["time_Slots"] <= self.parameter_Dict["nPhone_Threshold"]:
             print("Phoneme to Phone Weight: " + str(self.parameter_Dict[("Weight", "Phoneme_to_Phone")]));
@@ -129,80 +179,573 @@ class TISK_Model:
         if word_to_SPhone_Inhibition is not None:
             self.parameter_Dict[("Feedback", "Word_to_SPhone_Inhibition")] = word_to_SPhone_Inhibition;
 
-        self.initialized = False;
+        if self.initialized and (word_to_Diphone_Activation is not None or word_to_SPhone_Activation is not None or word_to_Diphone_Inhibition is not None or word_to_SPhone_Inhibition is not None):
+            self.Feedback_Weight_Generate();
+
+    def Attested_Diphone_List(self, word_List):
+        #The open diphones of the words, in the order of the full diphone list.
+        attested_Diphone_Set = set();
+        for word in word_List:
+            attested_Diphone_Set.update(self.Open_Diphone_Generate(word));
+
+        return [first_Phoneme + second_Phoneme for first_Phoneme in self.phoneme_List for second_Phoneme in self.phoneme_List if first_Phoneme + second_Phoneme in attested_Diphone_Set];
+
+    def Incidence_Generate(self):
+        #The label structures which every connection is made from. They are computed once per lexicon.
+        self.Diphone_Structure_Generate();
+        self.word_Length_Array, self.word_Diphone_Incidence, self.word_Phoneme_Incidence = self.Word_Incidence_Generate(self.word_List);
+        self.shared_Feature_Count = None;   #Made by 'Word_to_Word_Weight_Generate' when it is needed.
+        self.Word_Buffer_Release();
+
+    def Diphone_Structure_Generate(self):
+        self.diphone_First_Index_Array = np.array([self.phoneme_Index_Dict[diphone[0]] for diphone in self.diphone_List], dtype=np.int64);
+        self.diphone_Second_Index_Array = np.array([self.phoneme_Index_Dict[diphone[1]] for diphone in self.diphone_List], dtype=np.int64);
+        #When a phoneme is inserted, the gates from the phoneme in later slots to the diphones which start with it (except the repeated diphone) are closed.
+        self.gate_Closure_Mask = (self.diphone_First_Index_Array[None, :] == np.arange(self.phoneme_Amount)[:, None]) & (self.diphone_First_Index_Array != self.diphone_Second_Index_Array)[None, :];
+        #The first phoneme term of 'Diphone_Input_Generate' has the gated sums and then the always open sums. The repeated diphones use the always open sums.
+        self.diphone_First_Lookup_Array = self.diphone_First_Index_Array + self.phoneme_Amount * (self.diphone_First_Index_Array == self.diphone_Second_Index_Array);
+
+        if self.factorized_Diphone:
+            self.phoneme_to_Diphone_First_Ramp = None;
+            self.phoneme_to_Diphone_Second_Ramp = None;
+            return;
+
+        #Phoneme -> Diphone weight is 'Phoneme_to_Phone' times these slot ramps: when slot is more later, the weight to the diphones which start with the phoneme decrease more, and the weight to the diphones which end with the phoneme increase more.
+        time_Slots = self.parameter_Dict["time_Slots"];
+        slot_Array = np.arange(time_Slots);
+        diphone_Index_Array = np.arange(self.diphone_Amount);
+        self.phoneme_to_Diphone_First_Ramp = np.zeros(shape=(time_Slots, self.phoneme_Amount, self.diphone_Amount), dtype=np.int64);
+        self.phoneme_to_Diphone_First_Ramp[:, self.diphone_First_Index_Array, diphone_Index_Array] = (time_Slots - 1 - slot_Array)[:, None];
+        self.phoneme_to_Diphone_First_Ramp = self.phoneme_to_Diphone_First_Ramp.reshape(time_Slots * self.phoneme_Amount, self.diphone_Amount);
+        self.phoneme_to_Diphone_Second_Ramp = np.zeros(shape=(time_Slots, self.phoneme_Amount, self.diphone_Amount), dtype=np.int64);
+        self.phoneme_to_Diphone_Second_Ramp[:, self.diphone_Second_Index_Array, diphone_Index_Array] = slot_Array[:, None];
+        self.phoneme_to_Diphone_Second_Ramp = self.phoneme_to_Diphone_Second_Ramp.reshape(time_Slots * self.phoneme_Amount, self.diphone_Amount);
+
+    def Word_Incidence_Generate(self, word_List):
+        word_Length_Array = np.array([len(word) for word in word_List], dtype=np.int64);
+        word_Diphone_Incidence = np.zeros(shape=(len(word_List), self.diphone_Amount), dtype=bool);   #Open diphones of each word
+        word_Phoneme_Incidence = np.zeros(shape=(len(word_List), self.phoneme_Amount), dtype=bool);
+        for word_Index, word in enumerate(word_List):
+            word_Diphone_Incidence[word_Index, [self.diphone_Index_Dict[diphone] for diphone in self.Open_Diphone_Generate(word)]] = True;
+            word_Phoneme_Incidence[word_Index, [self.phoneme_Index_Dict[phoneme] for phoneme in word]] = True;
+
+        return word_Length_Array, word_Diphone_Incidence, word_Phoneme_Incidence;
+
+    def Weight_Initialize(self, cache_Directory = None, cache_Size_Limit = 4 * 1024 ** 3):
+        """
+        Make all connections with the current parameters.
+
+        Parameters
+        ----------
+        cache_Directory : string, optional
+            If this parameter is assigned, the connections are kept in this directory as '.npy' files, keyed by the phoneme list, word list, time slots, and the parameters of the connections. When the same model is initialized again, the files are memory-mapped instead of being rebuilt.
+
+        cache_Size_Limit : int, optional
+            The maximum total size of 'cache_Directory' in bytes. When it is exceeded, the least recently used connections are deleted.
+
+        """
+        if not cache_Directory is None:
+            cache_Key = self.Weight_Cache_Key_Generate();
+            with self.Profile("Weight_Cache_Load"):
+                cache_Loaded = self.Weight_Cache_Load(cache_Directory, cache_Key);
+            if cache_Loaded:
+                print("Weight Connection: loaded from the cache '" + os.path.join(cache_Directory, cache_Key) + "'");
+                self.initialized = True;
+                with self.Profile("Weight_Cache_Evict"):
+                    self.Weight_Cache_Evict(cache_Directory, cache_Key, cache_Size_Limit);
+                return;
 
-    def Weight_Initialize(self):
         print("Weight Connection start...");
 
-        #Weight Generate
-        self.weightMatrix_Phoneme_to_Diphone = np.zeros(shape=(self.phoneme_Amount * self.parameter_Dict["time_Slots"], self.diphone_Amount));
-        self.weightMatrix_Phoneme_to_Single_Phone = np.zeros(shape=(self.phoneme_Amount * self.parameter_Dict["time_Slots"], self.phoneme_Amount));
-        self.weightMatrix_Diphone_to_Word = np.zeros(shape=(self.diphone_Amount, self.word_Amount));
-        self.weightMatrix_Single_Phone_to_Word = np.zeros(shape=(self.phoneme_Amount, self.word_Amount));
-        self.weightMatrix_Word_to_Word = np.zeros(shape=(self.word_Amount, self.word_Amount));
-        self.weightMatrix_Word_to_Diphone = np.zeros(shape=(self.word_Amount, self.diphone_Amount));
-        self.weightMatrix_Word_to_Single_Phone = np.zeros(shape=(self.word_Amount, self.phoneme_Amount));
+        with self.Profile("Weight_Incidence"):
+            self.Incidence_Generate();
 
         #Weight Connection
         #Phoneme -> Diphone & Single phone
         print("Weight Connection: Phoneme -> Diphone & Single phone");
-        for slot_Index in range(self.parameter_Dict["time_Slots"]):
-            for phoneme_Index in range(self.phoneme_Amount):
-                for diphone_Index in range(self.diphone_Amount):
-                    if self.phoneme_List[phoneme_Index] == self.diphone_List[diphone_Index][0]:
-                        self.weightMatrix_Phoneme_to_Diphone[slot_Index * self.phoneme_Amount + phoneme_Index, diphone_Index] += self.parameter_Dict[("Weight", "Phoneme_to_Phone")] * (self.parameter_Dict["time_Slots"] - 1 - slot_Index);    #When slot is more later, weight decrease more.
-                    if self.phoneme_List[phoneme_Index] == self.diphone_List[diphone_Index][1]:
-                        self.weightMatrix_Phoneme_to_Diphone[slot_Index * self.phoneme_Amount + phoneme_Index, diphone_Index] += self.parameter_Dict[("Weight", "Phoneme_to_Phone")] * slot_Index; #When slot is more later, weight increase more.
-                for single_Phone_Index in range(self.phoneme_Amount):
-                    if self.phoneme_List[phoneme_Index] == self.single_Phone_List[single_Phone_Index]:
-                        self.weightMatrix_Phoneme_to_Single_Phone[slot_Index * self.phoneme_Amount + phoneme_Index, single_Phone_Index] += self.parameter_Dict[("Weight", "Phoneme_to_Phone")] * self.parameter_Dict["time_Slots"];    #Always weight become 1
-
-        ##Diphone -> Word
-        print("Weight Connection: Diphone -> Word");
-        for diphone_Index in range(self.diphone_Amount):
-            for word_Index in range(self.word_Amount):
-                if self.diphone_List[diphone_Index] in self.Open_Diphone_Generate(self.word_List[word_Index]):
-                    self.weightMatrix_Diphone_to_Word[diphone_Index, word_Index] = self.parameter_Dict[("Weight", "Diphone_to_Word")] / len(self.word_List[word_Index]);   #Divide by the length of pronunciation
+        with self.Profile("Weight_Phoneme_to_Phone"):
+            self.Phoneme_Weight_Generate();
 
-        ##Single phone -> Word
+        ##Diphone -> Word & Single phone -> Word
+        print("Weight Connection: Diphone -> Word");
         print("Weight Connection: Single phone -> Word");
-        for single_Phone_Index in range(self.phoneme_Amount):
-            for word_Index in range(self.word_Amount):
-                if self.single_Phone_List[single_Phone_Index] in self.word_List[word_Index]:
-                    self.weightMatrix_Single_Phone_to_Word[single_Phone_Index, word_Index] = self.parameter_Dict[("Weight", "SPhone_to_Word")]; #Always weight become 0.01
+        with self.Profile("Weight_Phone_to_Word"):
+            self.Word_Weight_Generate();
 
         ##Word -> Word (Inhibition)
         print("Weight Connection: Word -> Word");
-        if self.parameter_Dict[("Weight", "Word_to_Word")] != 0:
-            for word1_Index in range(self.word_Amount):
-                for word2_Index in range(self.word_Amount):
-                    word1_Feature = set([self.word_List[word1_Index][x:x+2] for x in range(len(self.word_List[word1_Index]) - 1)] + list(self.word_List[word1_Index]));
-                    word2_Feature = set([self.word_List[word2_Index][x:x+2] for x in range(len(self.word_List[word2_Index]) - 1)] + list(self.word_List[word2_Index]));
-                    intersection = word1_Feature & word2_Feature;
-                    self.weightMatrix_Word_to_Word[word1_Index, word2_Index] = len(intersection); # shared feature is more, the inhibition also become stronger
-            for word_Index in range(self.word_Amount):
-                self.weightMatrix_Word_to_Word[word_Index, word_Index] = 0; # self inhibtion is 0
-            self.weightMatrix_Word_to_Word *= self.parameter_Dict[("Weight", "Word_to_Word")];
+        with self.Profile("Weight_Word_to_Word"):
+            self.Word_to_Word_Weight_Generate();
 
         ##Word -> Diphone & Single Phone
         print("Weight Connection: Word -> Diphone & Single Phone");
-        if self.parameter_Dict[("Feedback", "Word_to_Diphone_Activation")] != 0 or self.parameter_Dict[("Feedback", "Word_to_Diphone_Inhibition")] != 0 or self.parameter_Dict[("Feedback", "Word_to_SPhone_Activation")] != 0 or self.parameter_Dict[("Feedback", "Word_to_SPhone_Inhibition")] != 0:
-            for word_Index in range(self.word_Amount):
-                for diphone_Index in range(self.diphone_Amount):
-                    if self.diphone_List[diphone_Index] in self.Open_Diphone_Generate(self.word_List[word_Index]):
-                        self.weightMatrix_Word_to_Diphone[word_Index, diphone_Index] = self.parameter_Dict[("Feedback", "Word_to_Diphone_Activation")];
-                    else:
-                        self.weightMatrix_Word_to_Diphone[word_Index, diphone_Index] = self.parameter_Dict[("Feedback", "Word_to_Diphone_Inhibition")];
-                for single_Phone_Index in range(self.phoneme_Amount):
-                    if self.single_Phone_List[single_Phone_Index] in self.word_List[word_Index]:
-                        self.weightMatrix_Word_to_Single_Phone[word_Index, single_Phone_Index] = self.parameter_Dict[("Feedback", "Word_to_SPhone_Activation")];
-                    else:
-                        self.weightMatrix_Word_to_Single_Phone[word_Index, single_Phone_Index] = self.parameter_Dict[("Feedback", "Word_to_SPhone_Inhibition")];
+        with self.Profile("Weight_Word_to_Phone"):
+            self.Feedback_Weight_Generate();
 
         print("Weight Connection finished...");
 
         self.initialized = True;
 
+        if not cache_Directory is None:
+            with self.Profile("Weight_Cache_Save"):
+                self.Weight_Cache_Save(cache_Directory, cache_Key, cache_Size_Limit);
+
+    def Phoneme_Weight_Generate(self):
+        time_Slots = self.parameter_Dict["time_Slots"];
+        weight = self.parameter_Dict[("Weight", "Phoneme_to_Phone")];
+        if self.factorized_Diphone:
+            self.weightMatrix_Phoneme_to_Diphone = None;
+        else:
+            self.weightMatrix_Phoneme_to_Diphone = ((weight * self.phoneme_to_Diphone_First_Ramp).astype(self.dtype) + weight * self.phoneme_to_Diphone_Second_Ramp).astype(self.dtype);
+        self.weightMatrix_Phoneme_to_Single_Phone = np.tile(np.eye(self.phoneme_Amount, dtype=self.dtype) * (weight * time_Slots), (time_Slots, 1));    #Always weight become 1
+
+    def Word_Weight_Generate(self):
+        self.weightMatrix_Diphone_to_Word, self.weightMatrix_Single_Phone_to_Word = self.Word_Weight_Block_Generate(self.word_Diphone_Incidence, self.word_Phoneme_Incidence, self.word_Length_Array);
+        self.Word_Buffer_Release();
+
+    def Word_Weight_Block_Generate(self, word_Diphone_Incidence, word_Phoneme_Incidence, word_Length_Array):
+        #The Diphone -> Word and Single phone -> Word columns of the inserted words.
+        if self.sparse_Weight:
+            import scipy.sparse as sparse;
+            weightMatrix_Diphone_to_Word = sparse.csr_matrix(word_Diphone_Incidence.T).multiply((self.parameter_Dict[("Weight", "Diphone_to_Word")] / word_Length_Array).astype(self.dtype)).tocsr().astype(self.dtype);
+        else:
+            weightMatrix_Diphone_to_Word = word_Diphone_Incidence.T * (self.parameter_Dict[("Weight", "Diphone_to_Word")] / word_Length_Array).astype(self.dtype);   #Divide by the length of pronunciation
+
+        weightMatrix_Single_Phone_to_Word = word_Phoneme_Incidence.T * self.dtype.type(self.parameter_Dict[("Weight", "SPhone_to_Word")]); #Always weight become 0.01
+        if self.sparse_Weight:
+            weightMatrix_Single_Phone_to_Word = sparse.csr_matrix(weightMatrix_Single_Phone_to_Word);
+
+        return weightMatrix_Diphone_to_Word, weightMatrix_Single_Phone_to_Word;
+
+    def Word_to_Word_Weight_Generate(self):
+        if self.parameter_Dict[("Weight", "Word_to_Word")] != 0:
+            if self.shared_Feature_Count is None:   #Kept with the smallest unsigned integer type, so later changes of 'word_to_Word_Weight' only rescale it.
+                shared_Feature_Count = self.Shared_Feature_Count_Generate();
+                count_Type = np.min_scalar_type(int(shared_Feature_Count.max()) if shared_Feature_Count.shape[0] > 0 else 0);
+                self.shared_Feature_Count = shared_Feature_Count.astype(count_Type);
+                del shared_Feature_Count;
+            self.weightMatrix_Word_to_Word = self.Word_to_Word_Block_Generate(self.shared_Feature_Count);
+        elif self.sparse_Weight:
+            import scipy.sparse as sparse;
+            self.weightMatrix_Word_to_Word = sparse.csr_matrix((self.word_Amount, self.word_Amount), dtype=self.dtype);
+        else:
+            self.weightMatrix_Word_to_Word = np.zeros(shape=(self.word_Amount, self.word_Amount), dtype=self.dtype);
+        self.Word_Buffer_Release();
+
+    def Word_to_Word_Block_Generate(self, shared_Feature_Count):
+        weightMatrix_Word_to_Word = shared_Feature_Count.astype(self.dtype);   # shared feature is more, the inhibition also become stronger
+        weightMatrix_Word_to_Word *= self.parameter_Dict[("Weight", "Word_to_Word")];
+
+        return weightMatrix_Word_to_Word;
+
+    def Feedback_Weight_Generate(self):
+        self.weightMatrix_Word_to_Diphone, self.weightMatrix_Word_to_Single_Phone = self.Feedback_Weight_Block_Generate(self.word_Diphone_Incidence, self.word_Phoneme_Incidence);
+        self.Word_Buffer_Release();
+
+    def Feedback_Weight_Block_Generate(self, word_Diphone_Incidence, word_Phoneme_Incidence):
+        #The Word -> Diphone and Word -> Single phone rows of the inserted words.
+        if self.sparse_Weight:
+            import scipy.sparse as sparse;
+
+        if self.parameter_Dict[("Feedback", "Word_to_Diphone_Activation")] != 0 or self.parameter_Dict[("Feedback", "Word_to_Diphone_Inhibition")] != 0 or self.parameter_Dict[("Feedback", "Word_to_SPhone_Activation")] != 0 or self.parameter_Dict[("Feedback", "Word_to_SPhone_Inhibition")] != 0:
+            weightMatrix_Word_to_Diphone = np.where(word_Diphone_Incidence, self.dtype.type(self.parameter_Dict[("Feedback", "Word_to_Diphone_Activation")]), self.dtype.type(self.parameter_Dict[("Feedback", "Word_to_Diphone_Inhibition")]));
+            weightMatrix_Word_to_Single_Phone = np.where(word_Phoneme_Incidence, self.dtype.type(self.parameter_Dict[("Feedback", "Word_to_SPhone_Activation")]), self.dtype.type(self.parameter_Dict[("Feedback", "Word_to_SPhone_Inhibition")]));
+            if self.sparse_Weight and self.parameter_Dict[("Feedback", "Word_to_Diphone_Inhibition")] == 0 and self.parameter_Dict[("Feedback", "Word_to_SPhone_Inhibition")] == 0:   #Inhibition connects every non-member, so only the activation-only feedback is sparse.
+                weightMatrix_Word_to_Diphone = sparse.csr_matrix(weightMatrix_Word_to_Diphone);
+                weightMatrix_Word_to_Single_Phone = sparse.csr_matrix(weightMatrix_Word_to_Single_Phone);
+        elif self.sparse_Weight:
+            weightMatrix_Word_to_Diphone = sparse.csr_matrix((word_Diphone_Incidence.shape[0], self.diphone_Amount), dtype=self.dtype);
+            weightMatrix_Word_to_Single_Phone = sparse.csr_matrix((word_Phoneme_Incidence.shape[0], self.phoneme_Amount), dtype=self.dtype);
+        else:
+            weightMatrix_Word_to_Diphone = np.zeros(shape=(word_Diphone_Incidence.shape[0], self.diphone_Amount), dtype=self.dtype);
+            weightMatrix_Word_to_Single_Phone = np.zeros(shape=(word_Phoneme_Incidence.shape[0], self.phoneme_Amount), dtype=self.dtype);
+
+        return weightMatrix_Word_to_Diphone, weightMatrix_Word_to_Single_Phone;
+
+    def Weight_Attribute_Name_List(self):
+        #The attributes which 'Weight_Initialize' makes.
+        return [
+            "diphone_First_Index_Array", "diphone_Second_Index_Array", "diphone_First_Lookup_Array", "gate_Closure_Mask", "word_Length_Array", "word_Diphone_Incidence", "word_Phoneme_Incidence",
+            "phoneme_to_Diphone_First_Ramp", "phoneme_to_Diphone_Second_Ramp", "shared_Feature_Count",
+            "weightMatrix_Phoneme_to_Diphone", "weightMatrix_Phoneme_to_Single_Phone", "weightMatrix_Diphone_to_Word", "weightMatrix_Single_Phone_to_Word",
+            "weightMatrix_Word_to_Word", "weightMatrix_Word_to_Diphone", "weightMatrix_Word_to_Single_Phone"
+            ];
+
+    def Weight_Cache_Key_Generate(self):
+        key_Data = [
+            "TISK weight cache 3",
+            self.phoneme_List,
+            self.word_List,
+            int(self.parameter_Dict["time_Slots"]),     #The numbers are converted, so numpy scalars can be used as the parameters.
+            self.dtype.name,
+            bool(self.sparse_Weight),
+            [float(self.parameter_Dict[key]) for key in [("Weight", "Phoneme_to_Phone"), ("Weight", "Diphone_to_Word"), ("Weight", "SPhone_to_Word"), ("Weight", "Word_to_Word"), ("Feedback", "Word_to_Diphone_Activation"), ("Feedback", "Word_to_SPhone_Activation"), ("Feedback", "Word_to_Diphone_Inhibition"), ("Feedback", "Word_to_SPhone_Inhibition")]]
+            ];
+        if self.prune_Diphone:
+            key_Data.append(self.diphone_List);     #'Add_Words' appends the new diphones, so the order can differ from the order of the lexicon.
+        if self.factorized_Diphone:
+            key_Data.append("Factorized diphone");
+        return hashlib.sha1(json.dumps(key_Data).encode("utf-8")).hexdigest();
+
+    def Weight_Cache_Load(self, cache_Directory, cache_Key):
+        entry_Directory = os.path.join(cache_Directory, cache_Key);
+        index_File_Name = os.path.join(entry_Directory, "Weight_Cache.json");
+        if not os.path.isfile(index_File_Name):
+            return False;
+
+        with open(index_File_Name) as f:
+            array_File_Dict = json.load(f);
+        for name in self.Weight_Attribute_Name_List():    #The attributes which were 'None' are not saved.
+            setattr(self, name, None);
+        for name, array_File in array_File_Dict.items():
+            setattr(self, name, Array_File_Load(entry_Directory, array_File, mmap_Mode = "c"));     #Copy-on-write, so changing the loaded matrices never changes the cache.
+        os.utime(index_File_Name);  #The modified time is the last use for the eviction.
+        self.Word_Buffer_Release();
+
+        return True;
+
+    def Weight_Cache_Save(self, cache_Directory, cache_Key, cache_Size_Limit):
+        os.makedirs(cache_Directory, exist_ok=True);
+        entry_Directory = os.path.join(cache_Directory, cache_Key);
+        temporary_Directory = tempfile.mkdtemp(prefix=".tmp_", dir=cache_Directory);     #The entry appears at once by renaming, so a broken entry is never loaded.
+        try:
+            array_File_Dict = {name: Array_File_Save(temporary_Directory, name, getattr(self, name)) for name in self.Weight_Attribute_Name_List() if not getattr(self, name) is None};
+            with open(os.path.join(temporary_Directory, "Weight_Cache.json"), "w") as f:
+                json.dump(array_File_Dict, f);
+            os.rename(temporary_Directory, entry_Directory);
+        except OSError:
+            shutil.rmtree(temporary_Directory, ignore_errors=True);
+            if not os.path.isdir(entry_Directory):
+                raise;
+
+        self.Weight_Cache_Evict(cache_Directory, cache_Key, cache_Size_Limit);
+
+    def Weight_Cache_Evict(self, cache_Directory, cache_Key, cache_Size_Limit):
+        #Delete the least recently used entries until the total size is under 'cache_Size_Limit'. The entry 'cache_Key' is in use, so it is kept.
+        entry_List = [];
+        for entry_Name in os.listdir(cache_Directory):
+            index_File_Name = os.path.join(cache_Directory, entry_Name, "Weight_Cache.json");
+            if not os.path.isfile(index_File_Name):
+                continue;
+            entry_Size = sum([os.path.getsize(os.path.join(cache_Directory, entry_Name, file_Name)) for file_Name in os.listdir(os.path.join(cache_Directory, entry_Name))]);
+            entry_List.append((os.path.getmtime(index_File_Name), entry_Name, entry_Size));
+        total_Size = sum([entry_Size for _, _, entry_Size in entry_List]);
+        for _, entry_Name, entry_Size in sorted(entry_List):
+            if total_Size <= cache_Size_Limit:
+                break;
+            if entry_Name == cache_Key:
+                continue;
+            shutil.rmtree(os.path.join(cache_Directory, entry_Name), ignore_errors=True);
+            total_Size -= entry_Size;
+
+    def Shared_Feature_Count_Generate(self, pair_Buffer_Size = 10000000):
+        #The count of shared features (adjacent diphones and phonemes) of every word pair. It is built from a feature -> words inverted index, so the word pairs which share nothing are never visited.
+        feature_Word_Index_Dict = {};
+        for word_Index, word in enumerate(self.word_List):
+            for feature in set([word[x:x+2] for x in range(len(word) - 1)] + list(word)):
+                feature_Word_Index_Dict.setdefault(feature, []).append(word_Index);
+        feature_Word_Index_List = [np.array(word_Indices) for word_Indices in feature_Word_Index_Dict.values() if len(word_Indices) > 1];
+
+        if not self.sparse_Weight:
+            shared_Feature_Count = np.zeros(shape=(self.word_Amount, self.word_Amount), dtype=self.dtype);
+            for word_Indices in feature_Word_Index_List:
+                shared_Feature_Count[np.ix_(word_Indices, word_Indices)] += 1;
+            np.fill_diagonal(shared_Feature_Count, 0); # self inhibtion is 0
+            return shared_Feature_Count;
+
+        #Sparse counts are accumulated by row blocks, so the block size bounds the memory.
+        import scipy.sparse as sparse;
+        block_Amount = max(1, int(np.ceil(sum([len(word_Indices) ** 2 for word_Indices in feature_Word_Index_List]) / pair_Buffer_Size)));
+        block_Border_List = np.linspace(0, self.word_Amount, block_Amount + 1).astype(np.int64);
+        shared_Feature_Count_Block_List = [];
+        for block_Start, block_End in zip(block_Border_List[:-1], block_Border_List[1:]):
+            row_List = [np.zeros(0, dtype=np.int64)];
+            column_List = [np.zeros(0, dtype=np.int64)];
+            for word_Indices in feature_Word_Index_List:
+                block_Word_Indices = word_Indices[np.searchsorted(word_Indices, block_Start):np.searchsorted(word_Indices, block_End)];
+                rows = np.repeat(block_Word_Indices, len(word_Indices));
+                columns = np.tile(word_Indices, len(block_Word_Indices));
+                row_List.append(rows - block_Start);
+                column_List.append(columns);
+            shared_Feature_Count_Block = np.bincount(np.concatenate(row_List) * self.word_Amount + np.concatenate(column_List), minlength=(block_End - block_Start) * self.word_Amount).reshape(block_End - block_Start, self.word_Amount).astype(self.dtype);
+            shared_Feature_Count_Block[np.arange(block_End - block_Start), np.arange(block_Start, block_End)] = 0;   # self inhibtion is 0
+            shared_Feature_Count_Block_List.append(sparse.csr_matrix(shared_Feature_Count_Block));
+
+        return sparse.vstack(shared_Feature_Count_Block_List, format="csr");
+
+    def Word_Feature_Set(self, word):
+        #The features of 'Shared_Feature_Count_Generate': adjacent diphones and phonemes.
+        return set([word[x:x+2] for x in range(len(word) - 1)] + list(word));
+
+    def Feature_Word_Index_Generate(self):
+        #The feature -> word indices index of the current lexicon. It is made once, and 'Add_Words' and 'Remove_Words' change only the indices of the changed words.
+        if self.feature_Word_Index_Dict is None:
+            self.feature_Word_Index_Dict = {};
+            for word_Index, word in enumerate(self.word_List):
+                for feature in self.Word_Feature_Set(word):
+                    self.feature_Word_Index_Dict.setdefault(feature, set()).add(word_Index);
+
+        return self.feature_Word_Index_Dict;
+
+    def Shared_Feature_Count_Block_Generate(self, word_Index_Array):
+        #The shared feature counts between the words of 'word_Index_Array' and every word. Only the words which share a feature with them are visited.
+        feature_Word_Index_Dict = self.Feature_Word_Index_Generate();
+
+        shared_Feature_Count_Block = np.zeros(shape=(len(word_Index_Array), self.word_Amount), dtype=np.int64);
+        for block_Index, word_Index in enumerate(word_Index_Array):
+            word = self.word_List[word_Index];
+            feature_Word_Indices = [np.fromiter(feature_Word_Index_Dict[feature], dtype=np.int64) for feature in self.Word_Feature_Set(word)];
+            shared_Feature_Count_Block[block_Index] = np.bincount(np.concatenate(feature_Word_Indices), minlength=self.word_Amount);
+            shared_Feature_Count_Block[block_Index, word_Index] = 0;   # self inhibtion is 0
+
+        return shared_Feature_Count_Block;
+
+    def Add_Words(self, word_List):
+        """
+        Add words to the lexicon. If the model is initialized, only the connections of the added words are made, and the other connections are kept.
+
+        Parameters
+        ----------
+        word_List : list of string
+            The words to add. Each word should consist of the phonemes of the model, and should not be in the lexicon.
+
+        """
+        word_List = list(word_List);
+        for word in word_List:
+            if word in self.word_Index_Dict.keys() or word_List.count(word) > 1:
+                raise ValueError("'" + str(word) + "' is already in the lexicon or is inserted twice.");
+            for phoneme in word:
+                if not phoneme in self.phoneme_Index_Dict.keys():
+                    raise ValueError("The phoneme '" + str(phoneme) + "' of '" + str(word) + "' is not in the phoneme list.");
+            if len(word) > self.parameter_Dict["time_Slots"]:
+                raise Exception("Assigned time slot is lower than the length of the longest word");
+        if len(word_List) == 0:
+            return;
+        self.Diphone_Extend(word_List);
+
+        added_Index_Array = np.arange(self.word_Amount, self.word_Amount + len(word_List));
+        self.word_List = self.word_List + word_List;
+        for index, word in zip(added_Index_Array, word_List):
+            self.word_Index_Dict[word] = int(index);
+            if not self.feature_Word_Index_Dict is None:
+                for feature in self.Word_Feature_Set(word):
+                    self.feature_Word_Index_Dict.setdefault(feature, set()).add(int(index));
+        self.word_Amount = len(self.word_List);
+        self.category_Index_Dict = None;
+
+        if not hasattr(self, "word_Diphone_Incidence"):     #No connection is made yet.
+            return;
+        if self.sparse_Weight:
+            import scipy.sparse as sparse;
+
+        #The dense word side arrays are extended in their buffers, so only the rows and columns of the added words are written.
+        previous_Amount = int(added_Index_Array[0]);
+        added_Length_Array, added_Diphone_Incidence, added_Phoneme_Incidence = self.Word_Incidence_Generate(word_List);
+        self.Word_Axis_Resize("word_Length_Array", self.word_Amount)[previous_Amount:] = added_Length_Array;
+        self.Word_Axis_Resize("word_Diphone_Incidence", self.word_Amount)[previous_Amount:] = added_Diphone_Incidence;
+        self.Word_Axis_Resize("word_Phoneme_Incidence", self.word_Amount)[previous_Amount:] = added_Phoneme_Incidence;
+
+        if not self.shared_Feature_Count is None:
+            added_Count = self.Shared_Feature_Count_Block_Generate(added_Index_Array);     #(added words, all words). The count is symmetric, so the added columns are its transpose.
+            count_Type = np.promote_types(self.shared_Feature_Count.dtype, np.min_scalar_type(int(added_Count.max())));
+            self.Symmetric_Block_Extend("shared_Feature_Count", added_Count.astype(count_Type));
+
+        if not self.initialized:
+            return;
+
+        added_Diphone_to_Word, added_Single_Phone_to_Word = self.Word_Weight_Block_Generate(added_Diphone_Incidence, added_Phoneme_Incidence, added_Length_Array);
+        added_Word_to_Diphone, added_Word_to_Single_Phone = self.Feedback_Weight_Block_Generate(added_Diphone_Incidence, added_Phoneme_Incidence);
+        if self.sparse_Weight:
+            self.weightMatrix_Diphone_to_Word = sparse.hstack([self.weightMatrix_Diphone_to_Word, added_Diphone_to_Word], format="csr");
+            self.weightMatrix_Single_Phone_to_Word = sparse.hstack([self.weightMatrix_Single_Phone_to_Word, added_Single_Phone_to_Word], format="csr");
+        else:
+            self.Word_Axis_Resize("weightMatrix_Diphone_to_Word", self.word_Amount)[:, previous_Amount:] = added_Diphone_to_Word;
+            self.Word_Axis_Resize("weightMatrix_Single_Phone_to_Word", self.word_Amount)[:, previous_Amount:] = added_Single_Phone_to_Word;
+        if self.sparse_Weight and sparse.issparse(self.weightMatrix_Word_to_Diphone):
+            self.weightMatrix_Word_to_Diphone = sparse.vstack([self.weightMatrix_Word_to_Diphone, added_Word_to_Diphone], format="csr");
+            self.weightMatrix_Word_to_Single_Phone = sparse.vstack([self.weightMatrix_Word_to_Single_Phone, added_Word_to_Single_Phone], format="csr");
+        else:
+            self.Word_Axis_Resize("weightMatrix_Word_to_Diphone", self.word_Amount)[previous_Amount:] = added_Word_to_Diphone;
+            self.Word_Axis_Resize("weightMatrix_Word_to_Single_Phone", self.word_Amount)[previous_Amount:] = added_Word_to_Single_Phone;
+
+        if self.parameter_Dict[("Weight", "Word_to_Word")] != 0:
+            self.Symmetric_Block_Extend("weightMatrix_Word_to_Word", self.Word_to_Word_Block_Generate(added_Count));
+        elif self.sparse_Weight:
+            self.weightMatrix_Word_to_Word = sparse.csr_matrix((self.word_Amount, self.word_Amount), dtype=self.dtype);
+        else:
+            self.Symmetric_Block_Extend("weightMatrix_Word_to_Word", np.zeros(shape=(len(word_List), self.word_Amount), dtype=self.dtype));
+
+    def Diphone_Extend(self, word_List):
+        #With 'prune_Diphone', the open diphones of the added words which are not in the diphone layer are appended to it. The current words do not have them.
+        if not self.prune_Diphone:
+            return;
+        added_Diphone_List = [diphone for diphone in self.Attested_Diphone_List(word_List) if not diphone in self.diphone_Index_Dict];
+        if len(added_Diphone_List) == 0:
+            return;
+
+        for diphone in added_Diphone_List:
+            self.diphone_Index_Dict[diphone] = len(self.diphone_Index_Dict);
+        self.diphone_List = self.diphone_List + added_Diphone_List;
+        self.diphone_Amount = len(self.diphone_List);
+
+        if not hasattr(self, "word_Diphone_Incidence"):     #No connection is made yet.
+            return;
+        self.word_Diphone_Incidence = np.hstack([self.word_Diphone_Incidence, np.zeros(shape=(self.word_Diphone_Incidence.shape[0], len(added_Diphone_List)), dtype=bool)]);
+        self.Diphone_Structure_Generate();
+        self.Word_Buffer_Release();
+
+        if not self.initialized:
+            return;
+        self.Phoneme_Weight_Generate();
+        self.Word_Weight_Generate();
+        self.Feedback_Weight_Generate();
+
+    def Symmetric_Block_Extend(self, name, added_Row_Block):
+        #Extend the symmetric (words, words) attribute 'name' by the rows of the added words. 'added_Row_Block' is '(added words, all words)', and its transpose is used for the added columns.
+        matrix = getattr(self, name);
+        previous_Amount = matrix.shape[0];
+        if self.sparse_Weight and not isinstance(matrix, np.ndarray):    #CSR cannot be extended in place, so all nonzero values are copied.
+            import scipy.sparse as sparse;
+            setattr(self, name, sparse.vstack([
+                sparse.hstack([matrix, sparse.csr_matrix(added_Row_Block[:, :previous_Amount].T)]),
+                sparse.csr_matrix(added_Row_Block)
+                ], format="csr"));
+            return;
+
+        extended_Matrix = self.Word_Axis_Resize(name, added_Row_Block.shape[1], added_Row_Block.dtype);
+        extended_Matrix[previous_Amount:] = added_Row_Block;
+        extended_Matrix[:previous_Amount, previous_Amount:] = added_Row_Block[:, :previous_Amount].T;
+
+    def Word_Axis_Dict(self):
+        #The dense arrays which have the word axes, and the axes.
+        return {
+            "word_Length_Array": (0,), "word_Diphone_Incidence": (0,), "word_Phoneme_Incidence": (0,), "shared_Feature_Count": (0, 1),
+            "weightMatrix_Diphone_to_Word": (1,), "weightMatrix_Single_Phone_to_Word": (1,), "weightMatrix_Word_to_Word": (0, 1),
+            "weightMatrix_Word_to_Diphone": (0,), "weightMatrix_Word_to_Single_Phone": (0,)
+            };
+
+    def Word_Axis_Resize(self, name, word_Amount, dtype = None):
+        #Make the attribute 'name' a view of 'word_Amount' words of its buffer, and return it. The values of the kept words are not changed, and the new words should be written by the caller.
+        #If the attribute is not a view of its buffer (for example, after 'Weight_Initialize'), the buffer is too small, or the type is changed, a new buffer with 25% spare words is made.
+        #So the whole array is copied only once per growth of 25%, and the other calls write only the rows and columns of the added words.
+        value = getattr(self, name);
+        word_Axis_Tuple = self.Word_Axis_Dict()[name];
+        dtype = value.dtype if dtype is None else np.dtype(dtype);
+        buffer = self.word_Buffer_Dict.get(name);
+        if buffer is None or not value.base is buffer or buffer.dtype != dtype or buffer.shape[word_Axis_Tuple[0]] < word_Amount:
+            current_Amount = value.shape[word_Axis_Tuple[0]];
+            capacity = max(word_Amount, current_Amount + current_Amount // 4);
+            buffer = np.zeros(shape=[capacity if axis in word_Axis_Tuple else size for axis, size in enumerate(value.shape)], dtype=dtype);
+            kept_Slice = tuple([slice(0, min(current_Amount, word_Amount)) if axis in word_Axis_Tuple else slice(None) for axis in range(value.ndim)]);
+            buffer[kept_Slice] = value[kept_Slice];
+            self.word_Buffer_Dict[name] = buffer;
+
+        value = buffer[tuple([slice(0, word_Amount) if axis in word_Axis_Tuple else slice(None) for axis in range(buffer.ndim)])];
+        setattr(self, name, value);
+        return value;
+
+    def Word_Buffer_Release(self):
+        #Forget the buffers whose attributes were replaced (for example, by 'Weight_Initialize' or a parameter change), so they are not kept alive by 'word_Buffer_Dict'.
+        for name, buffer in list(self.word_Buffer_Dict.items()):
+            value = getattr(self, name, None);
+            if not isinstance(value, np.ndarray) or not value.base is buffer:
+                del self.word_Buffer_Dict[name];
+
+    def Remove_Words(self, word_List):
+        """
+        Remove words from the lexicon. If the model is initialized, the rows and columns of the removed words are deleted from the connections, and the other connections are kept.
+        The last words of 'word_List' move to the positions of the removed words, and the other words keep their indices. So only the rows and columns of the removed positions are written.
+
+        Parameters
+        ----------
+        word_List : list of string
+            The words to remove. Each word should be in the lexicon.
+
+        """
+        for word in word_List:
+            if not word in self.word_Index_Dict.keys():
+                raise ValueError("'" + str(word) + "' is not in the lexicon.");
+        if len(word_List) == 0:
+            return;
+
+        removed_Word_Set = set(word_List);
+        keep_Array = np.array([not word in removed_Word_Set for word in self.word_List], dtype=bool);
+        if not np.any(keep_Array):
+            raise ValueError("Every word of the lexicon cannot be removed.");
+
+        #The last words are moved to the positions of the removed words, so only the rows and columns of the removed words are written.
+        remain_Amount = int(np.sum(keep_Array));
+        hole_Index_Array = np.where(~keep_Array[:remain_Amount])[0];
+        moved_Index_Array = np.where(keep_Array[remain_Amount:])[0] + remain_Amount;
+        if not self.feature_Word_Index_Dict is None:
+            for word_Index in np.where(~keep_Array)[0]:
+                for feature in self.Word_Feature_Set(self.word_List[word_Index]):
+                    self.feature_Word_Index_Dict[feature].discard(int(word_Index));
+            for hole_Index, moved_Index in zip(hole_Index_Array, moved_Index_Array):
+                for feature in self.Word_Feature_Set(self.word_List[moved_Index]):
+                    self.feature_Word_Index_Dict[feature].discard(int(moved_Index));
+                    self.feature_Word_Index_Dict[feature].add(int(hole_Index));
+        remain_Word_List = self.word_List[:remain_Amount];
+        for hole_Index, moved_Index in zip(hole_Index_Array, moved_Index_Array):
+            remain_Word_List[hole_Index] = self.word_List[moved_Index];
+        self.word_List = remain_Word_List;
+        self.word_Index_Dict = {};
+        for index, word in enumerate(self.word_List):
+            self.word_Index_Dict.setdefault(word, index);   #Same to 'self.word_List.index()'
+        self.word_Amount = len(self.word_List);
+        self.category_Index_Dict = None;
+
+        if not hasattr(self, "word_Diphone_Incidence"):     #No connection is made yet.
+            return;
+
+        name_List = ["word_Length_Array", "word_Diphone_Incidence", "word_Phoneme_Incidence", "shared_Feature_Count"];
+        if self.initialized:
+            #With 'prune_Diphone', the diphones which only the removed words had are kept. They are not connected to any word, so they do not change the word activations.
+            name_List += ["weightMatrix_Diphone_to_Word", "weightMatrix_Single_Phone_to_Word", "weightMatrix_Word_to_Word", "weightMatrix_Word_to_Diphone", "weightMatrix_Word_to_Single_Phone"];
+        order_Array = np.arange(remain_Amount);     #The previous index of each remaining word
+        order_Array[hole_Index_Array] = moved_Index_Array;
+        for name in name_List:
+            value = getattr(self, name);
+            if value is None:
+                continue;
+            word_Axis_Tuple = self.Word_Axis_Dict()[name];
+            if not isinstance(value, np.ndarray):   #CSR cannot be changed in place, so all nonzero values are copied once.
+                import scipy.sparse as sparse;
+                value = sparse.csr_matrix(value);
+                if 0 in word_Axis_Tuple:
+                    value = value[order_Array];
+                if 1 in word_Axis_Tuple:    #The column indices are mapped to the new indices, and the columns of the removed words are dropped.
+                    new_Index_Array = np.zeros(len(keep_Array), dtype=value.indices.dtype) - 1;
+                    new_Index_Array[order_Array] = np.arange(remain_Amount);
+                    column_Array = new_Index_Array[value.indices];
+                    kept_Array = column_Array >= 0;
+                    kept_Count_Array = np.concatenate([[0], np.cumsum(kept_Array)]);
+                    value = sparse.csr_matrix((value.data[kept_Array], column_Array[kept_Array], kept_Count_Array[value.indptr]), shape=(value.shape[0], remain_Amount));
+                setattr(self, name, value);
+                continue;
+
+            if not value.flags.writeable:
+                value = value.copy();
+            for axis in word_Axis_Tuple:
+                hole_Slice = tuple([hole_Index_Array if index == axis else slice(None) for index in range(value.ndim)]);
+                moved_Slice = tuple([moved_Index_Array if index == axis else slice(None) for index in range(value.ndim)]);
+                value[hole_Slice] = value[moved_Slice];
+            setattr(self, name, value[tuple([slice(0, remain_Amount) if axis in word_Axis_Tuple else slice(None) for axis in range(value.ndim)])]);
+        self.Word_Buffer_Release();
+
+    def Profiler_Assign(self, profiler = None):
+        """
+        Record the timings and counters of the following simulations to a 'TISK_Profiler'. If this parameter is 'None', nothing is recorded.
+
+        """
+        self.profiler = profiler;
+
+    def Profile(self, phase):
+        #The time of the 'with' block is added to 'phase' of the assigned profiler.
+        if self.profiler is None:
+            return contextlib.nullcontext();
+        return self.profiler.Phase(phase);
+
     def Parameter_Display(self):
         if self.initialized:
             for key in self.parameter_Dict.keys():
@@ -219,7 +762,7 @@ class TISK_Model:
         elif type(pronunciation) == list:
             inserted_Phoneme_List = pronunciation;
 
-        pattern = np.zeros(shape=(1, self.phoneme_Amount * self.parameter_Dict["time_Slots"]));
+        pattern = np.zeros(shape=(1, self.phoneme_Amount * self.parameter_Dict["time_Slots"]), dtype=self.dtype);
 
         for slot_Index in range(len(inserted_Phoneme_List)):
             if slot_Index in activation_Ratio_Dict.keys():
@@ -241,7 +784,7 @@ class TISK_Model:
 
         return open_Diphone_List;
 
-    def Run(self, pronunciation, activation_Ratio_Dict = {}):
+    def Run(self, pronunciation, activation_Ratio_Dict = {}, layer_List = None, unit_Index_Dict = None, cycle_Stride = 1):
         """
         Export the activation result about selected representations in inserted pronunciation simulation.
 
@@ -253,59 +796,75 @@ class TISK_Model:
         activation_Ratio_Dict : dict, optional
             This dict decided the phoneme activation of specific location. If you do not set, model will assign '1/size'
 
+        layer_List : list of string, optional
+            The layers which are recorded. Each item should be one of 'Phoneme', 'Diphone', 'Single_Phone', and 'Word'. If this parameter is 'None', all layers are recorded.
+
+        unit_Index_Dict : dict, optional
+            The unit indices which are recorded, per layer name. For example, '{"Word": [0, 5]}' records only the first and sixth words. A layer which is not in this dict records all units.
+
+        cycle_Stride : int, optional
+            Only every 'cycle_Stride'-th cycle (0, cycle_Stride, 2 * cycle_Stride, ...) is recorded.
+
         Returns
         -------
         out : ndarrays
             phoneme, diphone, single phone, and word activation matrix. Each matrix's first dimension is 'Time slot * ISetp'. This is cycle. You can see the specific timing by [row_Index,:]. Column index relates with the representation. You can know that each index represent what from the 'self.phoneme_List', 'self.diphone_List', 'self.diphone_List', and 'self_word_List'.
+            The layers which are not recorded are 'None'. With 'unit_Index_Dict' and 'cycle_Stride', the matrices have only the recorded units and cycles.
 
         """
 
         using_Pattern = self.Pattern_Generate(pronunciation, activation_Ratio_Dict);
-        phoneme_Activation_Cycle_List = [];
-        diphone_Activation_Cycle_List = [];
-        single_Phone_Activation_Cycle_List = [];
-        word_Activation_Cycle_List = [];
+        unit_Index_List, cycle_Stride = self.Record_Spec_Generate(layer_List, unit_Index_Dict, cycle_Stride);
+        activation_Cycle_List = [[], [], [], []];   #Phoneme, diphone, single phone, and word
+
+        if self.factorized_Diphone:     #There is no Phoneme -> Diphone matrix to copy, so the slots are simulated by 'Slot_Run' as a batch of one.
+            layer_Activation_List, gate_Close_Slot_Array = self.Layer_Initialize(1);
+            inserted_Phoneme_Index_Array = self.Inserted_Phoneme_Index_Generate([pronunciation]);
+            for slot_Index in range(self.parameter_Dict["time_Slots"]):
+                layer_Activation_List, gate_Close_Slot_Array, slot_Activation_Cycle_List = self.Slot_Run(layer_Activation_List, gate_Close_Slot_Array, using_Pattern, inserted_Phoneme_Index_Array[:, slot_Index], slot_Index, None, (unit_Index_List, cycle_Stride));
+                for activation_Cycle, slot_Activation_Cycle in zip(activation_Cycle_List, slot_Activation_Cycle_List):
+                    activation_Cycle.extend([activation[0] for activation in slot_Activation_Cycle]);
+
+            return tuple([None if unit_Index is None else np.array(activation_Cycle) for activation_Cycle, unit_Index in zip(activation_Cycle_List, unit_Index_List)]);
 
         ##Gate initialize
-        gate_Phoneme_to_Diphone = np.zeros(shape=(self.phoneme_Amount*self.parameter_Dict["time_Slots"], self.diphone_Amount)) + 1; #Initially all gates have state 1
+        gated_WeightMatrix_Phoneme_to_Diphone = self.weightMatrix_Phoneme_to_Diphone.copy(); #Initially all gates have state 1. Only gate closing changes this matrix.
 
         ##Layer Initialize
-        phoneme_Layer_Activation = np.zeros(shape = (1, self.phoneme_Amount * self.parameter_Dict["time_Slots"]))
-        diphone_Layer_Activation = np.zeros(shape = (1, self.diphone_Amount));
-        single_Phone_Layer_Activation = np.zeros(shape = (1, self.phoneme_Amount));
-        word_Layer_Activation = np.zeros(shape = (1, self.word_Amount));
+        phoneme_Layer_Activation = np.zeros(shape = (1, self.phoneme_Amount * self.parameter_Dict["time_Slots"]), dtype=self.dtype)
+        diphone_Layer_Activation = np.zeros(shape = (1, self.diphone_Amount), dtype=self.dtype);
+        single_Phone_Layer_Activation = np.zeros(shape = (1, self.phoneme_Amount), dtype=self.dtype);
+        word_Layer_Activation = np.zeros(shape = (1, self.word_Amount), dtype=self.dtype);
 
         for slot_Index in range(self.parameter_Dict["time_Slots"]):
-            location_Input = np.zeros(shape = (1, self.phoneme_Amount * self.parameter_Dict["time_Slots"]));
+            location_Input = np.zeros(shape = (1, self.phoneme_Amount * self.parameter_Dict["time_Slots"]), dtype=self.dtype);
             location_Input[0, slot_Index*self.phoneme_Amount:(slot_Index+1)*self.phoneme_Amount] = 1;
             #Time control (The current phoneme location of pronunication)
             for step_Index in range(self.parameter_Dict["iStep"]):
                 phoneme_Layer_Storage = (using_Pattern * location_Input) * self.parameter_Dict[("Weight", "Input_to_Phoneme")];
-                diphone_Layer_Storage = phoneme_Layer_Activation.dot(gate_Phoneme_to_Diphone * self.weightMatrix_Phoneme_to_Diphone)
-                diphone_Layer_Storage = np.sign((np.sign(diphone_Layer_Storage - self.parameter_Dict["nPhone_Threshold"]) + 1) /2) / 10 + word_Layer_Activation.dot(self.weightMatrix_Word_to_Diphone);  #Binary + Feedback
+                diphone_Layer_Storage = phoneme_Layer_Activation.dot(gated_WeightMatrix_Phoneme_to_Diphone)
+                diphone_Layer_Storage = np.sign((np.sign(diphone_Layer_Storage - self.parameter_Dict["nPhone_Threshold"]) + 1) /2) / 10 + (word_Layer_Activation @ self.weightMatrix_Word_to_Diphone);  #Binary + Feedback
                 single_Phone_Layer_Storage = phoneme_Layer_Activation.dot(self.weightMatrix_Phoneme_to_Single_Phone);
-                single_Phone_Layer_Storage = np.sign((np.sign(single_Phone_Layer_Storage - self.parameter_Dict["nPhone_Threshold"]) + 1) /2) / 10 + word_Layer_Activation.dot(self.weightMatrix_Word_to_Single_Phone);  #Binary + Feedback
-                word_Layer_Storage = diphone_Layer_Activation.dot(self.weightMatrix_Diphone_to_Word) + single_Phone_Layer_Activation.dot(self.weightMatrix_Single_Phone_to_Word) + word_Layer_Activation.dot(self.weightMatrix_Word_to_Word);
+                single_Phone_Layer_Storage = np.sign((np.sign(single_Phone_Layer_Storage - self.parameter_Dict["nPhone_Threshold"]) + 1) /2) / 10 + (word_Layer_Activation @ self.weightMatrix_Word_to_Single_Phone);  #Binary + Feedback
+                word_Layer_Storage = (diphone_Layer_Activation @ self.weightMatrix_Diphone_to_Word) + (single_Phone_Layer_Activation @ self.weightMatrix_Single_Phone_to_Word) + (word_Layer_Activation @ self.weightMatrix_Word_to_Word);
 
                 phoneme_Layer_Activation = np.clip(phoneme_Layer_Activation * (1 - self.parameter_Dict[("Decay", "Phoneme")]) - np.abs(phoneme_Layer_Storage) * phoneme_Layer_Activation + phoneme_Layer_Storage.clip(min=0), 0, 1);
                 diphone_Layer_Activation = np.clip(diphone_Layer_Activation * (1 - self.parameter_Dict[("Decay", "Diphone")]) - np.abs(diphone_Layer_Storage) * diphone_Layer_Activation + diphone_Layer_Storage.clip(min=0), 0, 1);
                 single_Phone_Layer_Activation = np.clip(single_Phone_Layer_Activation * (1 - self.parameter_Dict[("Decay", "SPhone")]) - np.abs(single_Phone_Layer_Storage) * single_Phone_Layer_Activation + single_Phone_Layer_Storage.clip(min=0), 0, 1);
                 word_Layer_Activation = np.clip(word_Layer_Activation * (1 - self.parameter_Dict[("Decay", "Word")]) - np.abs(word_Layer_Storage) * word_Layer_Activation + word_Layer_Storage.clip(min=0), 0, 1);
 
-                phoneme_Activation_Cycle_List.append(phoneme_Layer_Activation.ravel());
-                diphone_Activation_Cycle_List.append(diphone_Layer_Activation.ravel());
-                single_Phone_Activation_Cycle_List.append(single_Phone_Layer_Activation.ravel());
-                word_Activation_Cycle_List.append(word_Layer_Activation.ravel());
+                if (slot_Index * self.parameter_Dict["iStep"] + step_Index) % cycle_Stride == 0:
+                    for activation_Cycle, layer_Activation, unit_Index in zip(activation_Cycle_List, [phoneme_Layer_Activation, diphone_Layer_Activation, single_Phone_Layer_Activation, word_Layer_Activation], unit_Index_List):
+                        if not unit_Index is None:
+                            activation_Cycle.append(layer_Activation.ravel()[unit_Index]);
             #Gate Close
-            if slot_Index < len(pronunciation): #If slot_Index is same or bigger than length of pronunciation, there is no input
-                for diphone_Index in range(self.diphone_Amount):
-                    if pronunciation[slot_Index] == self.diphone_List[diphone_Index][0] and pronunciation[slot_Index] != self.diphone_List[diphone_Index][1]: #Forward phone is same to inserted, and bacward phone is different
-                        for slot_Index_for_Gate in range(slot_Index + 1, self.parameter_Dict["time_Slots"]):   #This mean closing process only affect the slots which are after current slot.
-                            gate_Phoneme_to_Diphone[slot_Index_for_Gate * self.phoneme_Amount + self.phoneme_List.index(pronunciation[slot_Index]),diphone_Index] = 0;    #Assign 0
+            if slot_Index < len(pronunciation) and pronunciation[slot_Index] in self.phoneme_Index_Dict: #If slot_Index is same or bigger than length of pronunciation, there is no input
+                phoneme_Index = self.phoneme_Index_Dict[pronunciation[slot_Index]];
+                gated_WeightMatrix_Phoneme_to_Diphone[(slot_Index + 1) * self.phoneme_Amount + phoneme_Index::self.phoneme_Amount, self.gate_Closure_Mask[phoneme_Index]] = 0;   #This mean closing process only affect the slots which are after current slot.
 
-        return np.array(phoneme_Activation_Cycle_List), np.array(diphone_Activation_Cycle_List), np.array(single_Phone_Activation_Cycle_List), np.array(word_Activation_Cycle_List);
+        return tuple([None if unit_Index is None else np.array(activation_Cycle) for activation_Cycle, unit_Index in zip(activation_Cycle_List, unit_Index_List)]);
 
-    def Multi_Run(self, pronunciation_List):
+    def Multi_Run(self, pronunciation_List, layer_List = None, unit_Index_Dict = None, cycle_Stride = 1):
         """
         Export the activation result about selected representations in inserted pronunciation simulation.
 
@@ -314,106 +873,614 @@ class TISK_Model:
         pronunciation : string or list of string
             The list or string about phonemes.
 
+        layer_List : list of string, optional
+            The layers which are recorded. Each item should be one of 'Phoneme', 'Diphone', 'Single_Phone', and 'Word'. If this parameter is 'None', all layers are recorded.
+
+        unit_Index_Dict : dict, optional
+            The unit indices which are recorded, per layer name. For example, '{"Word": [0, 5]}' records only the first and sixth words. A layer which is not in this dict records all units.
+
+        cycle_Stride : int, optional
+            Only every 'cycle_Stride'-th cycle (0, cycle_Stride, 2 * cycle_Stride, ...) is recorded.
+
         Returns
         -------
         out : ndarrays
             phoneme, diphone, single phone, and word activation matrix. Each matrix's first is the word index. Second dimension is 'Time slot * ISetp'. This is cycle. You can see the specific timing of specific word by [:, row_Index,:]. Third index relates with the representation. You can know that each index represent what from the 'self.phoneme_List', 'self.diphone_List', 'self.diphone_List', and 'self_word_List'.
+            Same to 'Run', the layers which are not recorded are 'None'.
 
         """
 
-        pattern_List = [];
-        for pronunciation in pronunciation_List:
-            pattern_List.append(self.Pattern_Generate(pronunciation));
-        using_Pattern = np.vstack(pattern_List);
+        using_Pattern = np.vstack([self.Pattern_Generate(pronunciation) for pronunciation in pronunciation_List]);
+        inserted_Phoneme_Index_Array = self.Inserted_Phoneme_Index_Generate(pronunciation_List);
+        stacked_WeightMatrix_Phoneme_to_Diphone = self.Gated_Weight_Generate();
+        record_Spec = self.Record_Spec_Generate(layer_List, unit_Index_Dict, cycle_Stride);
 
-        phoneme_Activation_Cycle_List = [];
-        diphone_Activation_Cycle_List = [];
-        single_Phone_Activation_Cycle_List = [];
-        word_Activation_Cycle_List = [];
+        layer_Activation_List, gate_Close_Slot_Array = self.Layer_Initialize(len(pronunciation_List));
+        activation_Cycle_List = [[], [], [], []];   #Phoneme, diphone, single phone, and word
+        for slot_Index in range(self.parameter_Dict["time_Slots"]):
+            layer_Activation_List, gate_Close_Slot_Array, slot_Activation_Cycle_List = self.Slot_Run(layer_Activation_List, gate_Close_Slot_Array, using_Pattern, inserted_Phoneme_Index_Array[:, slot_Index], slot_Index, stacked_WeightMatrix_Phoneme_to_Diphone, record_Spec);
+            for activation_Cycle, slot_Activation_Cycle in zip(activation_Cycle_List, slot_Activation_Cycle_List):
+                activation_Cycle.extend(slot_Activation_Cycle);
 
-        ##Gate initialize
-        gate_Phoneme_to_Diphone = np.zeros(shape=(len(pronunciation_List), self.phoneme_Amount*self.parameter_Dict["time_Slots"], self.diphone_Amount)) + 1; #Initially all gates have state 1
+        with self.Profile("Stacking"):
+            phoneme_Activation_Cycle, diphone_Activation_Cycle, single_Phone_Activation_Cycle, word_Activation_Cycle = [
+                None if unit_Index is None else np.rollaxis(np.array(activation_Cycle), 1)
+                for activation_Cycle, unit_Index in zip(activation_Cycle_List, record_Spec[0])
+                ];
 
-        ##Layer Initialize
-        phoneme_Layer_Activation = np.zeros(shape = (len(pronunciation_List), self.phoneme_Amount * self.parameter_Dict["time_Slots"]))
-        diphone_Layer_Activation = np.zeros(shape = (len(pronunciation_List), self.diphone_Amount));
-        single_Phone_Layer_Activation = np.zeros(shape = (len(pronunciation_List), self.phoneme_Amount));
-        word_Layer_Activation = np.zeros(shape = (len(pronunciation_List), self.word_Amount));
+        return phoneme_Activation_Cycle, diphone_Activation_Cycle, single_Phone_Activation_Cycle, word_Activation_Cycle;
+
+    def Prefix_Shared_Multi_Run(self, pronunciation_List, layer_List = None, unit_Index_Dict = None, cycle_Stride = 1):
+        """
+        Export the same activation result as 'Multi_Run', but the pronunciations which share a prefix are simulated together until they diverge.
+        The batches of the matrix products differ from 'Multi_Run', so the activations are the same up to floating point rounding (a few 1e-16).
+
+        Everything before a slot depends only on the phonemes inserted until that slot, so the pronunciations are arranged in a trie.
+        At each slot, the layer and gate state of every trie node is branched from its parent node, and only the distinct prefixes are simulated.
 
+        Parameters
+        ----------
+        pronunciation_List : list of string or string list
+            The list or pronunciations. Each item should be a phoneme string of a list of phonemes.
+
+        layer_List, unit_Index_Dict, cycle_Stride : list of string, dict, int, optional
+            Same as 'Multi_Run'.
+
+        Returns
+        -------
+        out : ndarrays
+            Same as 'Multi_Run'.
+
+        """
+
+        using_Pattern = np.vstack([self.Pattern_Generate(pronunciation) for pronunciation in pronunciation_List]);
+        inserted_Phoneme_Index_Array = self.Inserted_Phoneme_Index_Generate(pronunciation_List);
+        stacked_WeightMatrix_Phoneme_to_Diphone = self.Gated_Weight_Generate();
+        record_Spec = self.Record_Spec_Generate(layer_List, unit_Index_Dict, cycle_Stride);
+
+        layer_Activation_List, gate_Close_Slot_Array = self.Layer_Initialize(1);   #The root node: nothing is inserted.
+        node_Index_Array = np.zeros(shape=(len(pronunciation_List), self.parameter_Dict["time_Slots"]), dtype=np.int64);   #The trie node of each pronunciation at each slot
+        node_Activation_Cycle_List = [];
         for slot_Index in range(self.parameter_Dict["time_Slots"]):
-            location_Input = np.zeros(shape = (len(pronunciation_List), self.phoneme_Amount * self.parameter_Dict["time_Slots"]));
-            location_Input[:, slot_Index*self.phoneme_Amount:(slot_Index+1)*self.phoneme_Amount] = 1;
-            #Time control (The current phoneme location of pronunication)
-            for step_Index in range(self.parameter_Dict["iStep"]):
+            node_Index_Dict = {};
+            representative_Index_List = [];
+            parent_Index_List = [];
+            for pronunciation_Index, pronunciation in enumerate(pronunciation_List):
+                prefix = tuple(pronunciation[:slot_Index + 1]);     #After the end of a pronunciation, its prefix is the whole pronunciation and is not shared with longer pronunciations.
+                if not prefix in node_Index_Dict:
+                    node_Index_Dict[prefix] = len(node_Index_Dict);
+                    representative_Index_List.append(pronunciation_Index);
+                    parent_Index_List.append(node_Index_Array[pronunciation_Index, slot_Index - 1] if slot_Index > 0 else 0);
+                node_Index_Array[pronunciation_Index, slot_Index] = node_Index_Dict[prefix];
+
+            #Branch
+            layer_Activation_List = [layer_Activation[parent_Index_List] for layer_Activation in layer_Activation_List];
+            gate_Close_Slot_Array = gate_Close_Slot_Array[parent_Index_List];
+
+            layer_Activation_List, gate_Close_Slot_Array, slot_Activation_Cycle_List = self.Slot_Run(layer_Activation_List, gate_Close_Slot_Array, using_Pattern[representative_Index_List], inserted_Phoneme_Index_Array[representative_Index_List, slot_Index], slot_Index, stacked_WeightMatrix_Phoneme_to_Diphone, record_Spec);
+            node_Activation_Cycle_List.append([np.array(slot_Activation_Cycle) for slot_Activation_Cycle in slot_Activation_Cycle_List]);
+
+        with self.Profile("Stacking"):
+            phoneme_Activation_Cycle, diphone_Activation_Cycle, single_Phone_Activation_Cycle, word_Activation_Cycle = [
+                None if record_Spec[0][layer_Index] is None else np.rollaxis(np.concatenate([
+                    node_Activation_Cycle_List[slot_Index][layer_Index][:, node_Index_Array[:, slot_Index]]
+                    for slot_Index in range(self.parameter_Dict["time_Slots"])
+                    if len(node_Activation_Cycle_List[slot_Index][layer_Index]) > 0     #With 'cycle_Stride', some slots have no recorded cycle.
+                    ]), 1)
+                for layer_Index in range(4)
+                ];
+
+        return phoneme_Activation_Cycle, diphone_Activation_Cycle, single_Phone_Activation_Cycle, word_Activation_Cycle;
+
+    def Record_Spec_Generate(self, layer_List = None, unit_Index_Dict = None, cycle_Stride = 1):
+        #The recorded units of each layer ('None' means that the layer is not recorded, and 'slice(None)' means all units) and the cycle stride.
+        layer_Name_List = ["Phoneme", "Diphone", "Single_Phone", "Word"];
+        if layer_List is None:
+            layer_List = layer_Name_List;
+        if unit_Index_Dict is None:
+            unit_Index_Dict = {};
+        for layer_Name in list(layer_List) + list(unit_Index_Dict.keys()):
+            if not layer_Name in layer_Name_List:
+                raise ValueError("'" + str(layer_Name) + "' is not a layer name. Use 'Phoneme', 'Diphone', 'Single_Phone', or 'Word'.");
+        for layer_Name in unit_Index_Dict.keys():
+            if not layer_Name in layer_List:
+                raise ValueError("The units of '" + layer_Name + "' are assigned, but the layer is not in 'layer_List'.");
+        if not isinstance(cycle_Stride, (int, np.integer)) or cycle_Stride < 1:
+            raise ValueError("'cycle_Stride' should be a positive integer.");
+
+        unit_Index_List = [];
+        for layer_Name in layer_Name_List:
+            if not layer_Name in layer_List:
+                unit_Index_List.append(None);
+            elif layer_Name in unit_Index_Dict.keys():
+                unit_Index_List.append(np.asarray(unit_Index_Dict[layer_Name], dtype=np.int64));
+            else:
+                unit_Index_List.append(slice(None));
+
+        return unit_Index_List, int(cycle_Stride);
+
+    def Inserted_Phoneme_Index_Generate(self, pronunciation_List):
+        #The phoneme index which closes gates after each slot. -1 means that no gate is closed after the slot.
+        inserted_Phoneme_Index_Array = np.zeros(shape=(len(pronunciation_List), self.parameter_Dict["time_Slots"]), dtype=np.int64) - 1;
+        for pronunciation_Index, pronunciation in enumerate(pronunciation_List):
+            for slot_Index in range(min(len(pronunciation), self.parameter_Dict["time_Slots"])):
+                if pronunciation[slot_Index] in self.phoneme_Index_Dict:
+                    inserted_Phoneme_Index_Array[pronunciation_Index, slot_Index] = self.phoneme_Index_Dict[pronunciation[slot_Index]];
+
+        return inserted_Phoneme_Index_Array;
+
+    def Gated_Weight_Generate(self):
+        #Gates only close the connections in 'gate_Closure_Mask', for the slots after the slot where the phoneme was inserted.
+        #So the gate state of each pronunciation is kept as that slot per phoneme, and the closable connections are separated from the others.
+        #With 'factorized_Diphone', 'Slot_Run' does not use this matrix.
+        if self.factorized_Diphone:
+            return None;
+        closable_Mask = np.tile(self.gate_Closure_Mask, (self.parameter_Dict["time_Slots"], 1));
+        return np.vstack([self.weightMatrix_Phoneme_to_Diphone * closable_Mask, self.weightMatrix_Phoneme_to_Diphone * ~closable_Mask]);
+
+    def Layer_Initialize(self, batch_Size):
+        layer_Activation_List = [
+            np.zeros(shape = (batch_Size, self.phoneme_Amount * self.parameter_Dict["time_Slots"]), dtype=self.dtype),
+            np.zeros(shape = (batch_Size, self.diphone_Amount), dtype=self.dtype),
+            np.zeros(shape = (batch_Size, self.phoneme_Amount), dtype=self.dtype),
+            np.zeros(shape = (batch_Size, self.word_Amount), dtype=self.dtype)
+            ];
+        gate_Close_Slot_Array = np.zeros(shape=(batch_Size, self.phoneme_Amount), dtype=np.int64) + self.parameter_Dict["time_Slots"]; #Initially all gates have state 1
+
+        return layer_Activation_List, gate_Close_Slot_Array;
+
+    def Slot_Run(self, layer_Activation_List, gate_Close_Slot_Array, using_Pattern, inserted_Phoneme_Index_Array, slot_Index, stacked_WeightMatrix_Phoneme_to_Diphone, record_Spec = None, step_Count = None, first_Cycle = None):
+        #Simulate the 'iStep' cycles of one slot for a batch, and close the gates of the inserted phonemes after the slot.
+        #'record_Spec' is the result of 'Record_Spec_Generate'. If it is 'None', every layer is recorded at every cycle.
+        #'step_Count' and 'first_Cycle' replace 'iStep' and the cycle of the first step. 'TISK_Simulation' uses them for the cycles without input.
+        step_Count = self.parameter_Dict["iStep"] if step_Count is None else step_Count;
+        first_Cycle = slot_Index * self.parameter_Dict["iStep"] if first_Cycle is None else first_Cycle;
+        phoneme_Layer_Activation, diphone_Layer_Activation, single_Phone_Layer_Activation, word_Layer_Activation = layer_Activation_List;
+        activation_Cycle_List = [[], [], [], []];
+        unit_Index_List, cycle_Stride = record_Spec or ([slice(None)] * 4, 1);
+
+        location_Input = np.zeros(shape = (1, self.phoneme_Amount * self.parameter_Dict["time_Slots"]), dtype=self.dtype);
+        location_Input[:, slot_Index*self.phoneme_Amount:(slot_Index+1)*self.phoneme_Amount] = 1;
+        with self.Profile("Gate"):
+            unit_Slot_Index_Array = np.repeat(np.arange(self.parameter_Dict["time_Slots"]), self.phoneme_Amount);
+            gate_Open_Array = unit_Slot_Index_Array[None, :] <= np.tile(gate_Close_Slot_Array, (1, self.parameter_Dict["time_Slots"]));
+        #Time control (The current phoneme location of pronunication)
+        #With a profiler, the input and the update of each layer are added to the phase of the layer.
+        for step_Index in range(step_Count):
+            with self.Profile("Phoneme_Layer"):
                 phoneme_Layer_Storage = (using_Pattern * location_Input) * self.parameter_Dict[("Weight", "Input_to_Phoneme")];
-                gated_WeightMatrix_Phoneme_to_Diphone = gate_Phoneme_to_Diphone * self.weightMatrix_Phoneme_to_Diphone;
-                diphone_Layer_Storage = np.vstack([np.dot(phoneme_Layer_Activation[[x]], gated_WeightMatrix_Phoneme_to_Diphone[x]) for x in range(len(pronunciation_List))]);   #Because weight is 3D.
-                diphone_Layer_Storage = np.sign((np.sign(diphone_Layer_Storage - self.parameter_Dict["nPhone_Threshold"]) + 1) /2) / 10 + word_Layer_Activation.dot(self.weightMatrix_Word_to_Diphone);  #Binary + Feedback
+            with self.Profile("Diphone_Layer"):
+                if self.factorized_Diphone:
+                    diphone_Layer_Storage = self.Diphone_Input_Generate(phoneme_Layer_Activation, gate_Open_Array, self.parameter_Dict[("Weight", "Phoneme_to_Phone")]);
+                else:
+                    diphone_Layer_Storage = np.hstack([phoneme_Layer_Activation * gate_Open_Array, phoneme_Layer_Activation]).dot(stacked_WeightMatrix_Phoneme_to_Diphone);   #Closable and always open connections in one product
+                diphone_Layer_Storage = np.sign((np.sign(diphone_Layer_Storage - self.parameter_Dict["nPhone_Threshold"]) + 1) /2) / 10 + (word_Layer_Activation @ self.weightMatrix_Word_to_Diphone);  #Binary + Feedback
+            with self.Profile("Single_Phone_Layer"):
                 single_Phone_Layer_Storage = phoneme_Layer_Activation.dot(self.weightMatrix_Phoneme_to_Single_Phone);
-                single_Phone_Layer_Storage = np.sign((np.sign(single_Phone_Layer_Storage - self.parameter_Dict["nPhone_Threshold"]) + 1) /2) / 10 + word_Layer_Activation.dot(self.weightMatrix_Word_to_Single_Phone);  #Binary + Feedback
-                word_Layer_Storage = diphone_Layer_Activation.dot(self.weightMatrix_Diphone_to_Word) + single_Phone_Layer_Activation.dot(self.weightMatrix_Single_Phone_to_Word) + word_Layer_Activation.dot(self.weightMatrix_Word_to_Word);
+                single_Phone_Layer_Storage = np.sign((np.sign(single_Phone_Layer_Storage - self.parameter_Dict["nPhone_Threshold"]) + 1) /2) / 10 + (word_Layer_Activation @ self.weightMatrix_Word_to_Single_Phone);  #Binary + Feedback
+            with self.Profile("Word_Layer"):
+                word_Layer_Storage = (diphone_Layer_Activation @ self.weightMatrix_Diphone_to_Word) + (single_Phone_Layer_Activation @ self.weightMatrix_Single_Phone_to_Word) + (word_Layer_Activation @ self.weightMatrix_Word_to_Word);
 
+            with self.Profile("Phoneme_Layer"):
                 phoneme_Layer_Activation = np.clip(phoneme_Layer_Activation * (1 - self.parameter_Dict[("Decay", "Phoneme")]) - np.abs(phoneme_Layer_Storage) * phoneme_Layer_Activation + phoneme_Layer_Storage.clip(min=0), 0, 1);
+            with self.Profile("Diphone_Layer"):
                 diphone_Layer_Activation = np.clip(diphone_Layer_Activation * (1 - self.parameter_Dict[("Decay", "Diphone")]) - np.abs(diphone_Layer_Storage) * diphone_Layer_Activation + diphone_Layer_Storage.clip(min=0), 0, 1);
+            with self.Profile("Single_Phone_Layer"):
                 single_Phone_Layer_Activation = np.clip(single_Phone_Layer_Activation * (1 - self.parameter_Dict[("Decay", "SPhone")]) - np.abs(single_Phone_Layer_Storage) * single_Phone_Layer_Activation + single_Phone_Layer_Storage.clip(min=0), 0, 1);
+            with self.Profile("Word_Layer"):
                 word_Layer_Activation = np.clip(word_Layer_Activation * (1 - self.parameter_Dict[("Decay", "Word")]) - np.abs(word_Layer_Storage) * word_Layer_Activation + word_Layer_Storage.clip(min=0), 0, 1);
 
-                phoneme_Activation_Cycle_List.append(phoneme_Layer_Activation);
-                diphone_Activation_Cycle_List.append(diphone_Layer_Activation);
-                single_Phone_Activation_Cycle_List.append(single_Phone_Layer_Activation);
-                word_Activation_Cycle_List.append(word_Layer_Activation);
-            for pronunciation_Index in range(len(pronunciation_List)):
-                pronunciation = pronunciation_List[pronunciation_Index]
-                if slot_Index < len(pronunciation): #If slot_Index is same or bigger than length of pronunciation, there is no input
-                    for diphone_Index in range(self.diphone_Amount):
-                        if pronunciation[slot_Index] == self.diphone_List[diphone_Index][0] and pronunciation[slot_Index] != self.diphone_List[diphone_Index][1]: #Forward phone is same to inserted, and bacward phone is different
-                            for slot_Index_for_Gate in range(slot_Index + 1, self.parameter_Dict["time_Slots"]):   #This mean closing process only affect the slots which are after current slot.
-                                gate_Phoneme_to_Diphone[pronunciation_Index, slot_Index_for_Gate * self.phoneme_Amount + self.phoneme_List.index(pronunciation[slot_Index]),diphone_Index] = 0;    #Assign 0
+            if not self.profiler is None:
+                self.profiler.Active_Unit_Add(first_Cycle + step_Index, [phoneme_Layer_Activation, diphone_Layer_Activation, single_Phone_Layer_Activation, word_Layer_Activation]);
+
+            if (first_Cycle + step_Index) % cycle_Stride == 0:
+                for activation_Cycle, layer_Activation, unit_Index in zip(activation_Cycle_List, [phoneme_Layer_Activation, diphone_Layer_Activation, single_Phone_Layer_Activation, word_Layer_Activation], unit_Index_List):
+                    if not unit_Index is None:
+                        activation_Cycle.append(layer_Activation[:, unit_Index]);
+
+        #Gate Close
+        with self.Profile("Gate"):
+            closing_Index_Array = np.where(inserted_Phoneme_Index_Array >= 0)[0];
+            closing_Phoneme_Index_Array = inserted_Phoneme_Index_Array[closing_Index_Array];
+            gate_Close_Slot_Array = gate_Close_Slot_Array.copy();
+            gate_Close_Slot_Array[closing_Index_Array, closing_Phoneme_Index_Array] = np.minimum(gate_Close_Slot_Array[closing_Index_Array, closing_Phoneme_Index_Array], slot_Index);   #This mean closing process only affect the slots which are after current slot.
+
+        return [phoneme_Layer_Activation, diphone_Layer_Activation, single_Phone_Layer_Activation, word_Layer_Activation], gate_Close_Slot_Array, activation_Cycle_List;
+
+    def Diphone_Input_Generate(self, phoneme_Layer_Activation, gate_Open_Array, weight):
+        #The Phoneme -> Diphone input without the matrix. The column of a diphone is the first ramp on the slots of its first phoneme plus the second ramp on the slots of its second phoneme,
+        #so the input is the ramp weighted slot sum of the first phoneme plus that of the second phoneme. Only the first term of the non-repeated diphones is gated.
+        time_Slots = self.parameter_Dict["time_Slots"];
+        slot_Array = np.arange(time_Slots);
+        first_Ramp = (weight * (time_Slots - 1 - slot_Array)).astype(self.dtype);
+        second_Ramp = (weight * slot_Array).astype(self.dtype);
+        phoneme_Activation = phoneme_Layer_Activation.reshape(-1, time_Slots, self.phoneme_Amount);
+
+        first_Term = np.hstack([
+            np.einsum("bsp,s->bp", phoneme_Activation * gate_Open_Array.reshape(-1, time_Slots, self.phoneme_Amount), first_Ramp),
+            np.einsum("bsp,s->bp", phoneme_Activation, first_Ramp)
+            ]);
+        second_Term = np.einsum("bsp,s->bp", phoneme_Activation, second_Ramp);
+
+        return np.take(first_Term, self.diphone_First_Lookup_Array, axis=1) + np.take(second_Term, self.diphone_Second_Index_Array, axis=1);     #'np.take' is faster than the fancy indexing of columns.
+
+    def Sweep_Structure_Generate(self, word_to_Word = True, feedback = True):
+        #The connections of 'Weight_Initialize' without their parameters. 'Sweep_Slot_Run' multiplies the products by the parameters of each row, so one structure serves every parameter set.
+        if not hasattr(self, "word_Diphone_Incidence"):
+            self.Incidence_Generate();
+        time_Slots = self.parameter_Dict["time_Slots"];
+        if self.sparse_Weight:
+            import scipy.sparse as sparse;
+
+        structure_Dict = {};
+
+        if self.factorized_Diphone:     #'Sweep_Slot_Run' uses 'Diphone_Input_Generate'.
+            structure_Dict["Phoneme_to_Diphone"] = None;
+        else:
+            phoneme_to_Diphone = (self.phoneme_to_Diphone_First_Ramp + self.phoneme_to_Diphone_Second_Ramp).astype(self.dtype);
+            closable_Mask = np.tile(self.gate_Closure_Mask, (time_Slots, 1));
+            structure_Dict["Phoneme_to_Diphone"] = np.vstack([phoneme_to_Diphone * closable_Mask, phoneme_to_Diphone * ~closable_Mask]);
+        structure_Dict["Phoneme_to_Single_Phone"] = np.tile(np.eye(self.phoneme_Amount, dtype=self.dtype), (time_Slots, 1));
+
+        structure_Dict["Diphone_to_Word"] = self.word_Diphone_Incidence.T * (1 / self.word_Length_Array).astype(self.dtype);
+        structure_Dict["Single_Phone_to_Word"] = self.word_Phoneme_Incidence.T.astype(self.dtype);
+        if self.sparse_Weight:
+            structure_Dict["Diphone_to_Word"] = sparse.csr_matrix(structure_Dict["Diphone_to_Word"]);
+            structure_Dict["Single_Phone_to_Word"] = sparse.csr_matrix(structure_Dict["Single_Phone_to_Word"]);
+
+        if word_to_Word and self.shared_Feature_Count is None:
+            structure_Dict["Word_to_Word"] = self.Shared_Feature_Count_Generate();
+        elif word_to_Word:
+            structure_Dict["Word_to_Word"] = self.shared_Feature_Count.astype(self.dtype);
+        else:
+            structure_Dict["Word_to_Word"] = None;
+
+        if feedback:    #'np.where(incidence, activation, inhibition)' is split into the member part and the non-member part.
+            structure_Dict["Word_to_Diphone"] = self.word_Diphone_Incidence.astype(self.dtype);
+            structure_Dict["Word_to_Single_Phone"] = self.word_Phoneme_Incidence.astype(self.dtype);
+            if self.sparse_Weight:
+                structure_Dict["Word_to_Diphone"] = sparse.csr_matrix(structure_Dict["Word_to_Diphone"]);
+                structure_Dict["Word_to_Single_Phone"] = sparse.csr_matrix(structure_Dict["Word_to_Single_Phone"]);
+        else:
+            structure_Dict["Word_to_Diphone"] = None;
+            structure_Dict["Word_to_Single_Phone"] = None;
+
+        return structure_Dict;
+
+    def Sweep_Slot_Run(self, layer_Activation_List, gate_Close_Slot_Array, using_Pattern, inserted_Phoneme_Index_Array, slot_Index, structure_Dict, row_Parameter_Dict):
+        #Same to 'Slot_Run', but every row has its own parameters. 'row_Parameter_Dict' has a '(rows, 1)' array per key of 'self.parameter_Dict'.
+        phoneme_Layer_Activation, diphone_Layer_Activation, single_Phone_Layer_Activation, word_Layer_Activation = layer_Activation_List;
+        activation_Cycle_List = [[], [], [], []];
+
+        location_Input = np.zeros(shape = (1, self.phoneme_Amount * self.parameter_Dict["time_Slots"]), dtype=self.dtype);
+        location_Input[:, slot_Index*self.phoneme_Amount:(slot_Index+1)*self.phoneme_Amount] = 1;
+        unit_Slot_Index_Array = np.repeat(np.arange(self.parameter_Dict["time_Slots"]), self.phoneme_Amount);
+        gate_Open_Array = unit_Slot_Index_Array[None, :] <= np.tile(gate_Close_Slot_Array, (1, self.parameter_Dict["time_Slots"]));
+        phoneme_to_Single_Phone_Weight = row_Parameter_Dict[("Weight", "Phoneme_to_Phone")] * self.parameter_Dict["time_Slots"];
+        for step_Index in range(self.parameter_Dict["iStep"]):
+            phoneme_Layer_Storage = (using_Pattern * location_Input) * row_Parameter_Dict[("Weight", "Input_to_Phoneme")];
+            if structure_Dict["Phoneme_to_Diphone"] is None:
+                diphone_Layer_Storage = self.Diphone_Input_Generate(phoneme_Layer_Activation, gate_Open_Array, 1) * row_Parameter_Dict[("Weight", "Phoneme_to_Phone")];
+            else:
+                diphone_Layer_Storage = (np.hstack([phoneme_Layer_Activation * gate_Open_Array, phoneme_Layer_Activation]) @ structure_Dict["Phoneme_to_Diphone"]) * row_Parameter_Dict[("Weight", "Phoneme_to_Phone")];
+            diphone_Layer_Storage = np.sign((np.sign(diphone_Layer_Storage - self.parameter_Dict["nPhone_Threshold"]) + 1) /2) / 10;
+            single_Phone_Layer_Storage = (phoneme_Layer_Activation @ structure_Dict["Phoneme_to_Single_Phone"]) * phoneme_to_Single_Phone_Weight;
+            single_Phone_Layer_Storage = np.sign((np.sign(single_Phone_Layer_Storage - self.parameter_Dict["nPhone_Threshold"]) + 1) /2) / 10;
+            if not structure_Dict["Word_to_Diphone"] is None:     #Feedback
+                word_Activation_Sum = np.sum(word_Layer_Activation, axis=1, keepdims=True);
+                member_Diphone_Input = word_Layer_Activation @ structure_Dict["Word_to_Diphone"];
+                member_Single_Phone_Input = word_Layer_Activation @ structure_Dict["Word_to_Single_Phone"];
+                diphone_Layer_Storage = diphone_Layer_Storage + member_Diphone_Input * row_Parameter_Dict[("Feedback", "Word_to_Diphone_Activation")] + (word_Activation_Sum - member_Diphone_Input) * row_Parameter_Dict[("Feedback", "Word_to_Diphone_Inhibition")];
+                single_Phone_Layer_Storage = single_Phone_Layer_Storage + member_Single_Phone_Input * row_Parameter_Dict[("Feedback", "Word_to_SPhone_Activation")] + (word_Activation_Sum - member_Single_Phone_Input) * row_Parameter_Dict[("Feedback", "Word_to_SPhone_Inhibition")];
+            word_Layer_Storage = (diphone_Layer_Activation @ structure_Dict["Diphone_to_Word"]) * row_Parameter_Dict[("Weight", "Diphone_to_Word")] + (single_Phone_Layer_Activation @ structure_Dict["Single_Phone_to_Word"]) * row_Parameter_Dict[("Weight", "SPhone_to_Word")];
+            if not structure_Dict["Word_to_Word"] is None:
+                word_Layer_Storage = word_Layer_Storage + (word_Layer_Activation @ structure_Dict["Word_to_Word"]) * row_Parameter_Dict[("Weight", "Word_to_Word")];
+
+            phoneme_Layer_Activation = np.clip(phoneme_Layer_Activation * (1 - row_Parameter_Dict[("Decay", "Phoneme")]) - np.abs(phoneme_Layer_Storage) * phoneme_Layer_Activation + phoneme_Layer_Storage.clip(min=0), 0, 1);
+            diphone_Layer_Activation = np.clip(diphone_Layer_Activation * (1 - row_Parameter_Dict[("Decay", "Diphone")]) - np.abs(diphone_Layer_Storage) * diphone_Layer_Activation + diphone_Layer_Storage.clip(min=0), 0, 1);
+            single_Phone_Layer_Activation = np.clip(single_Phone_Layer_Activation * (1 - row_Parameter_Dict[("Decay", "SPhone")]) - np.abs(single_Phone_Layer_Storage) * single_Phone_Layer_Activation + single_Phone_Layer_Storage.clip(min=0), 0, 1);
+            word_Layer_Activation = np.clip(word_Layer_Activation * (1 - row_Parameter_Dict[("Decay", "Word")]) - np.abs(word_Layer_Storage) * word_Layer_Activation + word_Layer_Storage.clip(min=0), 0, 1);
+
+            activation_Cycle_List[0].append(phoneme_Layer_Activation);
+            activation_Cycle_List[1].append(diphone_Layer_Activation);
+            activation_Cycle_List[2].append(single_Phone_Layer_Activation);
+            activation_Cycle_List[3].append(word_Layer_Activation);
+
+        #Gate Close
+        closing_Index_Array = np.where(inserted_Phoneme_Index_Array >= 0)[0];
+        closing_Phoneme_Index_Array = inserted_Phoneme_Index_Array[closing_Index_Array];
+        gate_Close_Slot_Array = gate_Close_Slot_Array.copy();
+        gate_Close_Slot_Array[closing_Index_Array, closing_Phoneme_Index_Array] = np.minimum(gate_Close_Slot_Array[closing_Index_Array, closing_Phoneme_Index_Array], slot_Index);
+
+        return [phoneme_Layer_Activation, diphone_Layer_Activation, single_Phone_Layer_Activation, word_Layer_Activation], gate_Close_Slot_Array, activation_Cycle_List;
+
+    def RT_Multi_Run(self, pronunciation_List, absolute_Acc_Criteria=0.75, relative_Acc_Criteria=0.05, time_Acc_Criteria=10, structure_Dict=None, row_Parameter_Dict=None):
+        """
+        Export the reaction times of the inserted pronunciations without storing any activation pattern.
+        The three criteria are checked at every cycle while the simulation runs. After each slot, the pronunciations whose three reaction times are all decided are dropped from the batch.
 
-        total_Cycle = self.parameter_Dict["time_Slots"] * self.parameter_Dict["iStep"];
-        phoneme_Activation_Cycle = np.rollaxis(np.array(phoneme_Activation_Cycle_List), 1);
-        diphone_Activation_Cycle = np.rollaxis(np.array(diphone_Activation_Cycle_List), 1);
-        single_Phone_Activation_Cycle = np.rollaxis(np.array(single_Phone_Activation_Cycle_List), 1);
-        word_Activation_Cycle = np.rollaxis(np.array(word_Activation_Cycle_List), 1);
+        Parameters
+        ----------
+        pronunciation_List : list of string
+            The list or pronunciations. Each pronunciation should be in 'self.word_List'.
 
-        return phoneme_Activation_Cycle, diphone_Activation_Cycle, single_Phone_Activation_Cycle, word_Activation_Cycle;
+        absolute_Acc_Criteria, relative_Acc_Criteria, time_Acc_Criteria: float, float, integer
+            Same as the 'criterion' of 'RT_Absolute_Threshold', 'RT_Relative_Threshold', and 'RT_Time_Dependent'.
 
-    def RT_Absolute_Threshold(self, pronunciation, word_Activation_Array, criterion = 0.75):
-        target_Index = self.word_List.index(pronunciation);
-        target_Array = word_Activation_Array[:,target_Index]
-        other_Max_Array = np.max(np.delete(word_Activation_Array, (target_Index), 1), axis=1);
-        check_Array = (target_Array > criterion) * (other_Max_Array < criterion);
+        structure_Dict, row_Parameter_Dict : dict, dict, optional
+            Used by 'Parameter_Sweep'. If they are assigned, the batch is simulated by 'Sweep_Slot_Run' with the parameters of each row instead of the weights of the model.
 
-        for cycle in range(self.parameter_Dict["time_Slots"] * self.parameter_Dict["iStep"]):
-            if check_Array[cycle]:
-                return cycle;
+        Returns
+        -------
+        out : ndarray
+            The reaction time matrix. The shape is '(len(pronunciation_List), 3)', and the columns are absolute threshold, relative threshold, and time-dependent criteria. 'numpy.nan' means that the criterion was not satisfied.
 
-        return np.nan;
+        """
 
-    def RT_Relative_Threshold(self, pronunciation, word_Activation_Array, criterion = 0.05):
-        target_Index = self.word_List.index(pronunciation);
-        target_Array = word_Activation_Array[:,target_Index]
-        other_Max_Array = np.max(np.delete(word_Activation_Array, (target_Index), 1), axis=1);
+        total_Cycle = self.parameter_Dict["time_Slots"] * self.parameter_Dict["iStep"];
+        using_Pattern = np.vstack([self.Pattern_Generate(pronunciation) for pronunciation in pronunciation_List]);
+        inserted_Phoneme_Index_Array = self.Inserted_Phoneme_Index_Generate(pronunciation_List);
+        if row_Parameter_Dict is None:
+            stacked_WeightMatrix_Phoneme_to_Diphone = self.Gated_Weight_Generate();
+
+        rt_Array = np.zeros(shape=(len(pronunciation_List), 3)) + np.nan;
+        active_Index_Array = np.arange(len(pronunciation_List));    #The pronunciations which are still simulated
+        target_Index_Array = np.array([self.word_Index_Dict[pronunciation] for pronunciation in pronunciation_List], dtype=np.int64);
+        run_Length_Array = np.zeros(len(pronunciation_List), dtype=np.int64);   #How many cycles the target has been more activated than all other words
+        check_History_Array = None;
+        if time_Acc_Criteria < 1:   #The run length does not apply, so the winning cycles are kept for 'RT_Window_Search'. These pronunciations are simulated until the last cycle.
+            check_History_Array = np.zeros(shape=(len(pronunciation_List), total_Cycle), dtype=bool);
+
+        layer_Activation_List, gate_Close_Slot_Array = self.Layer_Initialize(len(pronunciation_List));
+        for slot_Index in range(self.parameter_Dict["time_Slots"]):
+            if row_Parameter_Dict is None:
+                layer_Activation_List, gate_Close_Slot_Array, slot_Activation_Cycle_List = self.Slot_Run(layer_Activation_List, gate_Close_Slot_Array, using_Pattern[active_Index_Array], inserted_Phoneme_Index_Array[active_Index_Array, slot_Index], slot_Index, stacked_WeightMatrix_Phoneme_to_Diphone, ([None, None, None, slice(None)], 1));
+            else:
+                with self.Profile("Sweep_Slot"):
+                    layer_Activation_List, gate_Close_Slot_Array, slot_Activation_Cycle_List = self.Sweep_Slot_Run(layer_Activation_List, gate_Close_Slot_Array, using_Pattern[active_Index_Array], inserted_Phoneme_Index_Array[active_Index_Array, slot_Index], slot_Index, structure_Dict, row_Parameter_Dict);
+
+            for step_Index, word_Layer_Activation in enumerate(slot_Activation_Cycle_List[3]):
+                with self.Profile("RT_Scoring"):
+                    cycle = slot_Index * self.parameter_Dict["iStep"] + step_Index;
+                    target_Array = word_Layer_Activation[np.arange(len(active_Index_Array)), target_Index_Array];
+                    other_Activation = word_Layer_Activation.copy();
+                    other_Activation[np.arange(len(active_Index_Array)), target_Index_Array] = -np.inf;
+                    other_Max_Array = np.max(other_Activation, axis=1);
+                    undecided_Array = np.isnan(rt_Array[active_Index_Array]);
+
+                    rt_Array[active_Index_Array[undecided_Array[:, 0] & (target_Array > absolute_Acc_Criteria) & (other_Max_Array < absolute_Acc_Criteria)], 0] = cycle;
+                    rt_Array[active_Index_Array[undecided_Array[:, 1] & (target_Array > other_Max_Array + relative_Acc_Criteria)], 1] = cycle;
+                    if not check_History_Array is None:
+                        check_History_Array[active_Index_Array, cycle] = target_Array > other_Max_Array;
+                        continue;
+                    run_Length_Array = np.where(target_Array > other_Max_Array, run_Length_Array + 1, 0);
+                    if cycle < total_Cycle - 1:     #Same to the last window of 'RT_Time_Dependent'
+                        rt_Array[active_Index_Array[undecided_Array[:, 2] & (run_Length_Array >= time_Acc_Criteria)], 2] = cycle + 1;
+
+            #Drop the decided pronunciations
+            remain_Array = np.any(np.isnan(rt_Array[active_Index_Array]), axis=1);
+            if not np.any(remain_Array):
+                break;
+            if not np.all(remain_Array):
+                active_Index_Array = active_Index_Array[remain_Array];
+                target_Index_Array = target_Index_Array[remain_Array];
+                run_Length_Array = run_Length_Array[remain_Array];
+                layer_Activation_List = [layer_Activation[remain_Array] for layer_Activation in layer_Activation_List];
+                gate_Close_Slot_Array = gate_Close_Slot_Array[remain_Array];
+                if not row_Parameter_Dict is None:
+                    row_Parameter_Dict = {key: row_Parameter[remain_Array] for key, row_Parameter in row_Parameter_Dict.items()};
+
+        if not check_History_Array is None:
+            rt_Array[:, 2] = self.RT_Window_Search(check_History_Array, time_Acc_Criteria);
+
+        return rt_Array;
 
-        for cycle in range(self.parameter_Dict["time_Slots"] * self.parameter_Dict["iStep"]):
-            if target_Array[cycle] > other_Max_Array[cycle] + criterion:
-                return cycle;
+    def RT_Absolute_Threshold(self, pronunciation, word_Activation_Array, criterion = 0.75):
+        return self.RT_Value(self.RT_Batch(word_Activation_Array[None], [self.word_Index_Dict[pronunciation]], absolute_Acc_Criteria=criterion)[0, 0]);
 
-        return np.nan;
+    def RT_Relative_Threshold(self, pronunciation, word_Activation_Array, criterion = 0.05):
+        return self.RT_Value(self.RT_Batch(word_Activation_Array[None], [self.word_Index_Dict[pronunciation]], relative_Acc_Criteria=criterion)[0, 1]);
 
     def RT_Time_Dependent(self, pronunciation, word_Activation_Array, criterion = 10):
-        target_Index = self.word_List.index(pronunciation);
-        target_Array = word_Activation_Array[:,target_Index]
-        other_Max_Array = np.max(np.delete(word_Activation_Array, (target_Index), 1), axis=1);
+        return self.RT_Value(self.RT_Batch(word_Activation_Array[None], [self.word_Index_Dict[pronunciation]], time_Acc_Criteria=criterion)[0, 2]);
+
+    def RT_Value(self, rt):
+        return np.nan if np.isnan(rt) else int(rt);
+
+    def RT_Batch(self, word_Activation_Array, target_Index_Array, absolute_Acc_Criteria=0.75, relative_Acc_Criteria=0.05, time_Acc_Criteria=10):
+        """
+        Calculate the three reaction times of a batch at once. The results are the same as 'RT_Absolute_Threshold', 'RT_Relative_Threshold', and 'RT_Time_Dependent'.
+
+        Parameters
+        ----------
+        word_Activation_Array : ndarray
+            The word activation of the batch. The shape is '(batch, cycles, words)', like the last result of 'Multi_Run'.
+
+        target_Index_Array : list of int or ndarray
+            The word index of the target of each pronunciation.
+
+        absolute_Acc_Criteria, relative_Acc_Criteria, time_Acc_Criteria: float, float, integer
+            Same as the 'criterion' of 'RT_Absolute_Threshold', 'RT_Relative_Threshold', and 'RT_Time_Dependent'.
+
+        Returns
+        -------
+        out : ndarray
+            The reaction time matrix. The shape is '(batch, 3)', and the columns are absolute threshold, relative threshold, and time-dependent criteria. 'numpy.nan' means that the criterion was not satisfied.
+
+        """
+        total_Cycle = self.parameter_Dict["time_Slots"] * self.parameter_Dict["iStep"];
+        word_Activation_Array = word_Activation_Array[:, :total_Cycle];
+        target_Index_Array = np.asarray(target_Index_Array, dtype=np.int64);
+        batch_Size, cycle_Size = word_Activation_Array.shape[:2];
+
+        #The maximum of the other words is the maximum of all words, except the cycles where the target is the maximum.
+        target_Array = np.take_along_axis(word_Activation_Array, np.broadcast_to(target_Index_Array[:, None, None], (batch_Size, cycle_Size, 1)), axis=2)[:, :, 0];
+        other_Max_Array = np.max(word_Activation_Array, axis=2);
+        target_Max_Batch_Array, target_Max_Cycle_Array = np.nonzero(target_Array == other_Max_Array);
+        if len(target_Max_Batch_Array) > 0:
+            target_Max_Activation = word_Activation_Array[target_Max_Batch_Array, target_Max_Cycle_Array];     #Copy of the selected cycles only
+            target_Max_Activation[np.arange(len(target_Max_Batch_Array)), target_Index_Array[target_Max_Batch_Array]] = -np.inf;
+            other_Max_Array[target_Max_Batch_Array, target_Max_Cycle_Array] = np.max(target_Max_Activation, axis=1);
+
+        rt_Array = np.zeros(shape=(batch_Size, 3)) + np.nan;
+        for column_Index, check_Array in enumerate([
+            (target_Array > absolute_Acc_Criteria) * (other_Max_Array < absolute_Acc_Criteria),
+            target_Array > other_Max_Array + relative_Acc_Criteria
+            ]):
+            hit_Array = np.any(check_Array, axis=1);
+            rt_Array[hit_Array, column_Index] = np.argmax(check_Array[hit_Array], axis=1);
+
+        #The target wins every cycle of the window 'cycle:cycle+criterion' when the cumulative count of the winning cycles increases by 'criterion'.
         check_Array = target_Array > other_Max_Array;
+        if time_Acc_Criteria >= 1:
+            if time_Acc_Criteria < cycle_Size:     #Otherwise 'range(total_Cycle - criterion)' is empty.
+                win_Count_Array = np.zeros(shape=(batch_Size, cycle_Size + 1), dtype=np.int64);
+                np.cumsum(check_Array, axis=1, out=win_Count_Array[:, 1:]);
+                window_Count = cycle_Size - time_Acc_Criteria;
+                window_Array = win_Count_Array[:, time_Acc_Criteria:time_Acc_Criteria + window_Count] - win_Count_Array[:, :window_Count] == time_Acc_Criteria;
+                hit_Array = np.any(window_Array, axis=1);
+                rt_Array[hit_Array, 2] = np.argmax(window_Array[hit_Array], axis=1) + time_Acc_Criteria;
+        else:
+            rt_Array[:, 2] = self.RT_Window_Search(check_Array, time_Acc_Criteria);
+
+        return rt_Array;
+
+    def RT_Window_Search(self, check_Array, criterion):
+        #The original window search of 'RT_Time_Dependent'. It is used for the criteria under 1, where the window 'cycle:cycle+criterion' is not a run of winning cycles.
+        total_Cycle = self.parameter_Dict["time_Slots"] * self.parameter_Dict["iStep"];
+        rt_Array = np.zeros(shape=(check_Array.shape[0])) + np.nan;
+        for batch_Index in range(check_Array.shape[0]):
+            for cycle in range(total_Cycle - criterion):
+                if all(check_Array[batch_Index, cycle:cycle+criterion]):
+                    rt_Array[batch_Index] = cycle + criterion;
+                    break;
+
+        return rt_Array;
+
+    def Run_List_Generator(self, pronunciation_List, absolute_Acc_Criteria=0.75, relative_Acc_Criteria=0.05, time_Acc_Criteria=10, batch_Size=100, shared_Prefix=False, early_Termination=True, layer_List=None, workers=1):
+        """
+        Yield the reaction times and the activation patterns of the inserted pronunciations one by one.
+        Only one batch of activation patterns is kept in memory, so this method can be used for the lists which are too large for 'Run_List'.
+
+        Parameters
+        ----------
+        pronunciation_List : list of string or string list
+            The list or pronunciations. Each item should be a phoneme string of a list of phonemes.
+
+        absolute_Acc_Criteria, relative_Acc_Criteria, time_Acc_Criteria: float, float, integer
+            Same as 'Run_List'.
+
+        batch_Size, shared_Prefix, early_Termination : int, bool, bool, optional
+            Same as 'Run_List'. If 'shared_Prefix' is 'True', the pronunciations are yielded in sorted order.
+
+        layer_List : list of string, optional
+            The layers whose activation patterns are yielded. Each item should be one of 'Phoneme', 'Diphone', 'Single_Phone', and 'Word'. If this parameter is 'None', no activation pattern is yielded and 'early_Termination' can be applied.
+            'Category' can also be used. Its pattern is the '(5, cycles)' result of 'Category_Mean_Generate', which is calculated once per batch.
 
-        for cycle in range(self.parameter_Dict["time_Slots"] * self.parameter_Dict["iStep"] - criterion):
-            if all(check_Array[cycle:cycle+criterion]):
-                return cycle + criterion;
+        workers : int, optional
+            Same as 'Run_List'.
 
-        return np.nan;
+        Yields
+        ------
+        out : tuple
+            '(index, pronunciation, absolute RT, relative RT, time-dependent RT, activation list)'. 'index' is the position in 'pronunciation_List'. The activation list has one matrix per item of 'layer_List'.
 
-    def Run_List(self, pronunciation_List, absolute_Acc_Criteria=0.75, relative_Acc_Criteria=0.05, time_Acc_Criteria=10, output_File_Name=None, raw_Data=False, categorize=False, reaction_Time=False, batch_Size=100):
+        """
+        layer_Index_Dict = {"Phoneme": 0, "Diphone": 1, "Single_Phone": 2, "Word": 3, "Category": 4};
+        if layer_List is None:
+            layer_List = [];
+        for layer_Name in layer_List:
+            if not layer_Name in layer_Index_Dict.keys():
+                raise ValueError("'" + str(layer_Name) + "' is not a layer name. Use 'Phoneme', 'Diphone', 'Single_Phone', 'Word', or 'Category'.");
+
+        if shared_Prefix:
+            simulation_Index_List = sorted(range(len(pronunciation_List)), key=lambda x: tuple(pronunciation_List[x]));    #The pronunciations which share prefixes are put in the same batch.
+        else:
+            simulation_Index_List = list(range(len(pronunciation_List)));
+
+        rt_Only = early_Termination and not shared_Prefix and len(layer_List) == 0 and time_Acc_Criteria >= 1;
+
+        batch_Index_List_List = [simulation_Index_List[batch_Index:batch_Index + batch_Size] for batch_Index in range(0, len(pronunciation_List), batch_Size)];
+        argument_List = [([pronunciation_List[x] for x in batch_Pronunciation_Index_List], absolute_Acc_Criteria, relative_Acc_Criteria, time_Acc_Criteria, shared_Prefix, rt_Only, layer_List) for batch_Pronunciation_Index_List in batch_Index_List_List];
+
+        if workers > 1 and len(batch_Index_List_List) > 1:
+            worker_Directory = tempfile.mkdtemp(prefix="TISK_");
+            pool = None;
+            try:
+                model_State, array_File_Dict = self.Worker_State_Generate(worker_Directory);
+                pool = multiprocessing.Pool(min(workers, len(batch_Index_List_List)), Pool_Worker_Initialize, (model_State, worker_Directory, array_File_Dict));
+                for batch_Pronunciation_Index_List, batch_Result_List in zip(batch_Index_List_List, pool.imap(Pool_Worker_Run, argument_List)):     #'imap' returns the batches in the inserted order.
+                    for pronunciation_Index, batch_Result in zip(batch_Pronunciation_Index_List, batch_Result_List):
+                        yield (pronunciation_Index, pronunciation_List[pronunciation_Index]) + batch_Result;
+            finally:
+                if not pool is None:
+                    pool.terminate();
+                    pool.join();
+                shutil.rmtree(worker_Directory, ignore_errors=True);
+        else:
+            for batch_Pronunciation_Index_List, argument in zip(batch_Index_List_List, argument_List):
+                for pronunciation_Index, batch_Result in zip(batch_Pronunciation_Index_List, self.Run_List_Batch(*argument)):
+                    yield (pronunciation_Index, pronunciation_List[pronunciation_Index]) + batch_Result;
+
+    def Run_List_Batch(self, pronunciation_List, absolute_Acc_Criteria, relative_Acc_Criteria, time_Acc_Criteria, shared_Prefix, rt_Only, layer_List):
+        layer_Index_Dict = {"Phoneme": 0, "Diphone": 1, "Single_Phone": 2, "Word": 3, "Category": 4};
+        simulation_Layer_List = [layer_Name for layer_Name in layer_List if layer_Name != "Category"] + ["Word"];   #The word layer is used for the reaction times and the categories.
+
+        if not self.profiler is None:
+            start_Time = time.perf_counter();
+            trace_Started = self.profiler.Memory_Trace_Start();
+
+        if rt_Only:
+            rt_Array = self.RT_Multi_Run(pronunciation_List, absolute_Acc_Criteria, relative_Acc_Criteria, time_Acc_Criteria);
+            activation_Array_List = [];
+        else:
+            if shared_Prefix:
+                activation_Array_List = list(self.Prefix_Shared_Multi_Run(pronunciation_List, layer_List=simulation_Layer_List));
+            else:
+                activation_Array_List = list(self.Multi_Run(pronunciation_List, layer_List=simulation_Layer_List));
+            with self.Profile("RT_Scoring"):
+                rt_Array = self.RT_Batch(activation_Array_List[3], [self.word_Index_Dict[pronunciation] for pronunciation in pronunciation_List], absolute_Acc_Criteria, relative_Acc_Criteria, time_Acc_Criteria);
+            if "Category" in layer_List:
+                with self.Profile("Categorization"):
+                    activation_Array_List.append(self.Category_Mean_Generate(pronunciation_List, activation_Array_List[3]));
+
+        if not self.profiler is None:
+            self.profiler.Batch_Add({
+                "Batch_Size": len(pronunciation_List),
+                "Time": time.perf_counter() - start_Time,
+                "Recorded_Bytes": int(sum([activation_Array.nbytes for activation_Array in activation_Array_List if not activation_Array is None])),     #The activation patterns which are kept for the batch
+                "Peak_Bytes": self.profiler.Memory_Trace_Stop(trace_Started)
+                });
+
+        if rt_Only:
+            return [tuple([self.RT_Value(rt) for rt in rt_Array[index]]) + ([],) for index in range(len(pronunciation_List))];
+        return [tuple([self.RT_Value(rt) for rt in rt_Array[index]]) + ([activation_Array_List[layer_Index_Dict[layer_Name]][index] for layer_Name in layer_List],) for index in range(len(pronunciation_List))];
+
+    def Worker_State_Generate(self, directory):
+        """
+        Save the arrays of the model as '.npy' files, so the worker processes of 'Run_List' load them by memory-mapping instead of receiving a copy.
+
+        Returns
+        -------
+        out : dict, dict
+            The attributes except the arrays, and the files of the arrays in 'directory'. 'Pool_Worker_Initialize' rebuilds the model from them.
+
+        """
+        model_State = {};
+        array_File_Dict = {};
+        for name, value in self.__dict__.items():
+            array_File = Array_File_Save(directory, name, value);
+            if array_File is None:
+                model_State[name] = value;
+            else:
+                array_File_Dict[name] = array_File;
+        model_State["profiler"] = None;     #The worker processes are not profiled.
+        model_State["word_Buffer_Dict"] = {};   #The worker processes do not edit the lexicon.
+        model_State["feature_Word_Index_Dict"] = None;
+
+        return model_State, array_File_Dict;
+
+    def Run_List(self, pronunciation_List, absolute_Acc_Criteria=0.75, relative_Acc_Criteria=0.05, time_Acc_Criteria=10, output_File_Name=None, raw_Data=False, categorize=False, reaction_Time=False, batch_Size=100, shared_Prefix=False, early_Termination=True, file_Format="text", workers=1):
         """
         Export the raw data and categorized result about all pronunciations of inserted list.
 
@@ -443,186 +1510,437 @@ class TISK_Model:
         batch_Size : int, optional
             How many words are simulated at one time. This parameter does not affect the reusult. However, the larger value, the faster processing speed, but the more memory required. If a 'memory error' occurs, reduce the size of this parameter because it means that you can not afford to load into the machine's memory.
 
+        shared_Prefix : bool, optional
+            If this parameter is 'True', the pronunciations are simulated in sorted order by 'Prefix_Shared_Multi_Run', so the cycles of a prefix which several pronunciations share are simulated once. The activations are the same up to floating point rounding, so a reaction time can move by one cycle only when two words are exactly tied.
+
+        early_Termination : bool, optional
+            If this parameter is 'True' and neither 'raw_Data' nor 'categorize' is 'True', the reaction times are calculated by 'RT_Multi_Run', which stops simulating each pronunciation once all three reaction times are decided. This parameter does not affect the result. It is not used with 'shared_Prefix'.
+
+        file_Format : string, optional
+            The format of the raw data files. If this parameter is 'text', the raw data is exported as tab-separated text files. If this parameter is 'npy', the activation pattern of each layer is exported as one '.npy' file whose shape is '(len(pronunciation_List), cycles, units)', with an index file '<output_File_Name>_Activation_Data_Index.json'. Use 'Activation_Data_Reader' to read them.
+
+        workers : int, optional
+            The number of processes which simulate the batches. If this parameter is larger than 1, the batches are spread over a process pool. The arrays of the model are saved once to a temporary directory and memory-mapped by every process. This parameter does not affect the result.
+
         Returns
         -------
         out : list of float
             the accuracy about inserted pronunciations
 
         """
-        spent_Time_List = [];
-
-        rt_Absolute_Threshold_List = [];
-        rt_Relative_Threshold_List = [];
-        rt_Time_Dependent_List = [];
-
-        phoneme_Activation_Array_List = [];
-        diphone_Activation_Array_List = [];
-        single_Phone_Activation_Array_List = [];
-        word_Activation_Array_List = [];
+        rt_Absolute_Threshold_List = [None] * len(pronunciation_List);
+        rt_Relative_Threshold_List = [None] * len(pronunciation_List);
+        rt_Time_Dependent_List = [None] * len(pronunciation_List);
 
-        for batch_Index in range(0, len(pronunciation_List), batch_Size):
-            start_Time = time.time();
-            phoneme_Activation_Array, diphone_Activation_Array, single_Phone_Activation_Array, word_Activation_Array = self.Multi_Run(pronunciation_List[batch_Index:batch_Index + batch_Size]);
-            spent_Time_List.append(time.time() - start_Time);
+        if not file_Format in ["text", "npy"]:
+            raise ValueError("'" + str(file_Format) + "' is not a file format. Use 'text' or 'npy'.");
 
-            for pronunciation_Index in range(min(len(pronunciation_List) - batch_Index, batch_Size)):
-                pronunciation = pronunciation_List[batch_Index + pronunciation_Index];
+        if (raw_Data and file_Format == "text") or categorize:
+            simulation_Index_List = sorted(range(len(pronunciation_List)), key=lambda x: pronunciation_List[x]);    #The exported files are sorted by pronunciation, so each pronunciation can be written as soon as it is simulated.
+        else:
+            simulation_Index_List = list(range(len(pronunciation_List)));
+        simulation_Pronunciation_List = [pronunciation_List[x] for x in simulation_Index_List];
 
-                phoneme_Activation_Array_List.append(phoneme_Activation_Array[pronunciation_Index]);
-                diphone_Activation_Array_List.append(diphone_Activation_Array[pronunciation_Index]);
-                single_Phone_Activation_Array_List.append(single_Phone_Activation_Array[pronunciation_Index]);
-                word_Activation_Array_List.append(word_Activation_Array[pronunciation_Index]);
+        if raw_Data:
+            layer_List = ["Phoneme", "Diphone", "Single_Phone", "Word"];
+        else:
+            layer_List = [];
+        if categorize:
+            layer_List = layer_List + ["Category"];     #The category averages are calculated once per batch.
+
+        time_Header = "\t".join([str(x) for x in range(0,self.parameter_Dict["time_Slots"] * self.parameter_Dict["iStep"])]) + "\n";
+        raw_Data_File_List = [];
+        raw_Data_Memmap_List = [];
+        if raw_Data and file_Format == "npy":
+            with self.Profile("File_IO"):
+                raw_Data_Memmap_List = self.Binary_Data_Open(
+                    output_File_Name + "_Activation_Data_Index.json",
+                    pronunciation_List,
+                    [(layer_Name, output_File_Name + "_" + layer_Name + "_Activation_Data.npy", self.Unit_Name_List(layer_Name)) for layer_Name in layer_List if layer_Name != "Category"]
+                    );
+        elif raw_Data:
+            for layer_Name, unit_Header in [("Phoneme", "Phoneme\tPosition"), ("Diphone", "Diphone"), ("Single_Phone", "Single_Phone"), ("Word", "Word")]:
+                fileStream = open(output_File_Name + "_" + layer_Name + "_Activation_Data.txt", "w");
+                fileStream.write("Target\t" + unit_Header + "\t" + time_Header);
+                raw_Data_File_List.append(fileStream);
+        category_File = None;
+        if categorize:
+            category_File = open(output_File_Name + "_Category_Activation_Data.txt", "w");
+            category_File.write("Target\tCategory\t" + time_Header);
+        reaction_Time_File = None;
+        if reaction_Time:
+            reaction_Time_File = open(output_File_Name + "_Reaction_Time.txt", "w");
+            reaction_Time_File.write("Target\tAbsolute\tRelative\tTime_Dependent");
+        written_RT_Count = 0;
 
-                rt_Absolute_Threshold_List.append(self.RT_Absolute_Threshold(pronunciation, word_Activation_Array_List[-1], absolute_Acc_Criteria));
-                rt_Relative_Threshold_List.append(self.RT_Relative_Threshold(pronunciation, word_Activation_Array_List[-1], relative_Acc_Criteria));
-                rt_Time_Dependent_List.append(self.RT_Time_Dependent(pronunciation, word_Activation_Array_List[-1], time_Acc_Criteria));
+        spent_Time_List = [];
+        try:
+            result_Generator = self.Run_List_Generator(simulation_Pronunciation_List, absolute_Acc_Criteria, relative_Acc_Criteria, time_Acc_Criteria, batch_Size, shared_Prefix, early_Termination, layer_List, workers);
+            while True:
+                start_Time = time.time();
+                try:
+                    simulation_Index, pronunciation, rt_Absolute, rt_Relative, rt_Time_Dependent, activation_Array_List = next(result_Generator);
+                except StopIteration:
+                    break;
+                spent_Time_List.append(time.time() - start_Time);
+
+                pronunciation_Index = simulation_Index_List[simulation_Index];
+                rt_Absolute_Threshold_List[pronunciation_Index] = rt_Absolute;
+                rt_Relative_Threshold_List[pronunciation_Index] = rt_Relative;
+                rt_Time_Dependent_List[pronunciation_Index] = rt_Time_Dependent;
+
+                with self.Profile("File_IO"):
+                    if raw_Data and file_Format == "npy":
+                        for raw_Data_Memmap, activation_Array in zip(raw_Data_Memmap_List, activation_Array_List[:4]):
+                            raw_Data_Memmap[pronunciation_Index] = activation_Array;
+                    elif raw_Data:
+                        for fileStream, text in zip(raw_Data_File_List, self.Raw_Data_Text_Generate(pronunciation, *activation_Array_List[:4])):
+                            fileStream.write(text);
+                if categorize:
+                    with self.Profile("Categorization"):
+                        category_Text = self.Category_Text_Generate(pronunciation, activation_Array_List[-1]);
+                    with self.Profile("File_IO"):
+                        category_File.write(category_Text);
+                if reaction_Time:
+                    with self.Profile("File_IO"):
+                        while written_RT_Count < len(pronunciation_List) and rt_Absolute_Threshold_List[written_RT_Count] is not None:     #The reaction times are written in the inserted order as soon as all previous pronunciations are done.
+                            reaction_Time_File.write("\n" + "\t".join([pronunciation_List[written_RT_Count], str(rt_Absolute_Threshold_List[written_RT_Count]), str(rt_Relative_Threshold_List[written_RT_Count]), str(rt_Time_Dependent_List[written_RT_Count])]));
+                            written_RT_Count += 1;
+        finally:
+            for fileStream in raw_Data_File_List + [category_File, reaction_Time_File]:
+                if fileStream is not None:
+                    fileStream.close();
+            for raw_Data_Memmap in raw_Data_Memmap_List:
+                raw_Data_Memmap.flush();
 
         print("Simulation time: " + str(round(np.sum(spent_Time_List), 3)) + "s");
         print("Simulation time per one word: " + str(round(np.sum(spent_Time_List) / len(pronunciation_List) , 3)) + "s");
 
-        if raw_Data:
-            output_Phoneme_Activation_Data = ["Target\tPhoneme\tPosition\t" + "\t".join([str(x) for x in range(0,self.parameter_Dict["time_Slots"] * self.parameter_Dict["iStep"])]) + "\n"];
-            output_Diphone_Activation_Data = ["Target\tDiphone\t" + "\t".join([str(x) for x in range(0,self.parameter_Dict["time_Slots"] * self.parameter_Dict["iStep"])]) + "\n"];
-            output_Single_Phone_Activation_Data = ["Target\tSingle_Phone\t" + "\t".join([str(x) for x in range(0,self.parameter_Dict["time_Slots"] * self.parameter_Dict["iStep"])]) + "\n"];
-            output_Word_Activation_Data = ["Target\tWord\t" + "\t".join([str(x) for x in range(0,self.parameter_Dict["time_Slots"] * self.parameter_Dict["iStep"])]) + "\n"];
-
-            for pronunciation in sorted(pronunciation_List):
-                pronunciation_Index = pronunciation_List.index(pronunciation);
-                for phoneme in sorted(self.phoneme_List):
-                    for location in range(self.parameter_Dict["time_Slots"]):
-                        phoneme_Index = self.phoneme_Amount * location + self.phoneme_List.index(phoneme);
-                        output_Phoneme_Activation_Data.append(pronunciation + "\t" + phoneme + "\t" + str(location) + "\t" + "\t".join([str(x) for x in phoneme_Activation_Array_List[pronunciation_Index][:,phoneme_Index]]) + "\n");
-
-                for diphone in sorted(self.diphone_List):
-                    diphone_Index = self.diphone_List.index(diphone);
-                    output_Diphone_Activation_Data.append(pronunciation + "\t" + diphone + "\t" + "\t".join([str(x) for x in diphone_Activation_Array_List[pronunciation_Index][:,diphone_Index]]) + "\n");
-
-                for single_Phone in sorted(self.single_Phone_List):
-                    single_Phone_Index = self.single_Phone_List.index(single_Phone);
-                    output_Single_Phone_Activation_Data.append(pronunciation + "\t" + single_Phone + "\t" + "\t".join([str(x) for x in single_Phone_Activation_Array_List[pronunciation_Index][:,single_Phone_Index]]) + "\n");
-
-                for word in sorted(self.word_List):
-                    word_Index = self.word_List.index(word);
-                    output_Word_Activation_Data.append(pronunciation + "\t" + word + "\t" + "\t".join([str(x) for x in word_Activation_Array_List[pronunciation_Index][:,word_Index]]) + "\n");
-
-            with open(output_File_Name + "_Phoneme_Activation_Data.txt", "w") as fileStream:
-                fileStream.write("".join(output_Phoneme_Activation_Data));
-            with open(output_File_Name + "_Diphone_Activation_Data.txt", "w") as fileStream:
-                fileStream.write("".join(output_Diphone_Activation_Data));
-            with open(output_File_Name + "_Single_Phone_Activation_Data.txt", "w") as fileStream:
-                fileStream.write("".join(output_Single_Phone_Activation_Data));
-            with open(output_File_Name + "_Word_Activation_Data.txt", "w") as fileStream:
-                fileStream.write("".join(output_Word_Activation_Data));
-
-        if categorize:
-            output_Category_Activation_Average_Data = ["Target\tCategory\t" + "\t".join([str(x) for x in range(0,self.parameter_Dict["time_Slots"] * self.parameter_Dict["iStep"])]) + "\n"];
-
-            for pronunciation in sorted(pronunciation_List):
-                pronunciation_Index = pronunciation_List.index(pronunciation);
-                cohort_List, rhyme_List, embedding_List, other_List = self.Category_List(pronunciation)
-
-                target_Activation_List = [];
-                cohort_Activation_List = [];
-                rhyme_Activation_List = [];
-                embedding_Activation_List = [];
-                other_Activation_List = [];
-
-                for word in sorted(self.word_List):
-                    word_Index = self.word_List.index(word);
-                    if pronunciation == word:
-                        target_Activation_List.append(word_Activation_Array_List[pronunciation_Index][:,word_Index]);
-                    if word in cohort_List:
-                        cohort_Activation_List.append(word_Activation_Array_List[pronunciation_Index][:,word_Index]);
-                    if word in rhyme_List:
-                        rhyme_Activation_List.append(word_Activation_Array_List[pronunciation_Index][:,word_Index]);
-                    if word in embedding_List:
-                        embedding_Activation_List.append(word_Activation_Array_List[pronunciation_Index][:,word_Index]);
-                    if word in other_List:
-                        other_Activation_List.append(word_Activation_Array_List[pronunciation_Index][:,word_Index]);
-
-                if len(target_Activation_List) == 0:
-                    target_Activation_List.append(np.zeros(self.parameter_Dict["time_Slots"] * self.parameter_Dict["iStep"]));
-                if len(cohort_Activation_List) == 0:
-                    cohort_Activation_List.append(np.zeros(self.parameter_Dict["time_Slots"] * self.parameter_Dict["iStep"]));
-                if len(rhyme_Activation_List) == 0:
-                    rhyme_Activation_List.append(np.zeros(self.parameter_Dict["time_Slots"] * self.parameter_Dict["iStep"]));
-                if len(embedding_Activation_List) == 0:
-                    embedding_Activation_List.append(np.zeros(self.parameter_Dict["time_Slots"] * self.parameter_Dict["iStep"]));
-                if len(other_Activation_List) == 0:
-                    other_Activation_List.append(np.zeros(self.parameter_Dict["time_Slots"] * self.parameter_Dict["iStep"]));
-
-                output_Category_Activation_Average_Data.append(pronunciation + "\tTarget\t" + "\t".join([str(x) for x in np.mean(target_Activation_List, axis=0)]) + "\n");
-                output_Category_Activation_Average_Data.append(pronunciation + "\tCohort\t" + "\t".join([str(x) for x in np.mean(cohort_Activation_List, axis=0)]) + "\n");
-                output_Category_Activation_Average_Data.append(pronunciation + "\tRhyme\t" + "\t".join([str(x) for x in np.mean(rhyme_Activation_List, axis=0)]) + "\n");
-                output_Category_Activation_Average_Data.append(pronunciation + "\tEmbedding\t" + "\t".join([str(x) for x in np.mean(embedding_Activation_List, axis=0)]) + "\n");
-                output_Category_Activation_Average_Data.append(pronunciation + "\tOther\t" + "\t".join([str(x) for x in np.mean(other_Activation_List, axis=0)]) + "\n");
-
-            with open(output_File_Name + "_Category_Activation_Data.txt", "w") as fileStream:
-                fileStream.write("".join(output_Category_Activation_Average_Data));
-
-        if reaction_Time:
-            output_Reaction_Time_Data = ["Target\tAbsolute\tRelative\tTime_Dependent"];
-            for index in range(len(pronunciation_List)):
-                output_Reaction_Time_Data.append("\t".join([pronunciation_List[index], str(rt_Absolute_Threshold_List[index]), str(rt_Relative_Threshold_List[index]), str(rt_Time_Dependent_List[index])]));
-            with open(output_File_Name + "_Reaction_Time.txt", "w") as fileStream:
-                fileStream.write("\n".join(output_Reaction_Time_Data));
+        return self.RT_Summary_Generate(rt_Absolute_Threshold_List, rt_Relative_Threshold_List, rt_Time_Dependent_List);
 
+    def RT_Summary_Generate(self, rt_Absolute_Threshold_List, rt_Relative_Threshold_List, rt_Time_Dependent_List):
         result_List = [];
         if all(np.isnan(rt_Absolute_Threshold_List)):
             result_List.append(np.nan);
         else:
             result_List.append(np.nanmean(rt_Absolute_Threshold_List));
-        result_List.append(np.count_nonzero(~np.isnan(rt_Absolute_Threshold_List)) / len(pronunciation_List))
+        result_List.append(np.count_nonzero(~np.isnan(rt_Absolute_Threshold_List)) / len(rt_Absolute_Threshold_List))
         if all(np.isnan(rt_Relative_Threshold_List)):
             result_List.append(np.nan);
         else:
             result_List.append(np.nanmean(rt_Relative_Threshold_List))
-        result_List.append(np.count_nonzero(~np.isnan(rt_Relative_Threshold_List)) / len(pronunciation_List))
+        result_List.append(np.count_nonzero(~np.isnan(rt_Relative_Threshold_List)) / len(rt_Relative_Threshold_List))
         if all(np.isnan(rt_Time_Dependent_List)):
             result_List.append(np.nan);
         else:
             result_List.append(np.nanmean(rt_Time_Dependent_List))
-        result_List.append(np.count_nonzero(~np.isnan(rt_Time_Dependent_List)) / len(pronunciation_List))
+        result_List.append(np.count_nonzero(~np.isnan(rt_Time_Dependent_List)) / len(rt_Time_Dependent_List))
 
         return result_List;
 
-    def Category_List(self, pronunciation):
-        cohort_List = [];
-        rhyme_List = [];
-        embedding_List = [];
-        other_List = [];
+    def Parameter_Sweep(self, parameter_Set_List, pronunciation_List, absolute_Acc_Criteria=0.75, relative_Acc_Criteria=0.05, time_Acc_Criteria=10, output_File_Name=None, batch_Size=100):
+        """
+        Calculate the reaction times and accuracies of the inserted pronunciations for many parameter sets.
+        The parameter sets are simulated together: every row of a batch is one pair of a parameter set and a pronunciation, and the connection structure is built once for all of them.
+
+        Parameters
+        ----------
+        parameter_Set_List : list of dict or dict of list
+            The parameter sets. The keys are the parameter names of 'Decay_Parameter_Assign', 'Weight_Parameter_Assign', and 'Feedback_Parameter_Assign' (for example, 'decay_Word' or 'word_to_Word_Weight'). A parameter which is not in a set uses the current value of the model. If this parameter is a dict of lists, every combination of the lists is simulated.
+
+        pronunciation_List : list of string
+            The list or pronunciations. Each pronunciation should be in 'self.word_List'.
+
+        absolute_Acc_Criteria, relative_Acc_Criteria, time_Acc_Criteria: float, float, integer
+            Same as 'Run_List'.
+
+        output_File_Name: string, optional
+            If this parameter is assigned, the result table is exported to '<output_File_Name>_Parameter_Sweep.txt'.
+
+        batch_Size : int, optional
+            How many rows (parameter set and pronunciation pairs) are simulated at one time. This parameter does not affect the result.
+
+        Returns
+        -------
+        out : list of dict
+            One dict per parameter set. It has the parameter values and 'RT_Absolute', 'ACC_Absolute', 'RT_Relative', 'ACC_Relative', 'RT_Time_Dependent', and 'ACC_Time_Dependent', which are the same as the result of 'Run_List'.
+
+        """
+        parameter_Key_Dict = {
+            "decay_Phoneme": ("Decay", "Phoneme"),
+            "decay_Diphone": ("Decay", "Diphone"),
+            "decay_SPhone": ("Decay", "SPhone"),
+            "decay_Word": ("Decay", "Word"),
+            "input_to_Phoneme_Weight": ("Weight", "Input_to_Phoneme"),
+            "phoneme_to_Phone_Weight": ("Weight", "Phoneme_to_Phone"),
+            "diphone_to_Word_Weight": ("Weight", "Diphone_to_Word"),
+            "sPhone_to_Word_Weight": ("Weight", "SPhone_to_Word"),
+            "word_to_Word_Weight": ("Weight", "Word_to_Word"),
+            "word_to_Diphone_Activation": ("Feedback", "Word_to_Diphone_Activation"),
+            "word_to_SPhone_Activation": ("Feedback", "Word_to_SPhone_Activation"),
+            "word_to_Diphone_Inhibition": ("Feedback", "Word_to_Diphone_Inhibition"),
+            "word_to_SPhone_Inhibition": ("Feedback", "Word_to_SPhone_Inhibition")
+            };
+
+        if isinstance(parameter_Set_List, dict):
+            parameter_Set_List = [dict(zip(parameter_Set_List.keys(), values)) for values in itertools.product(*parameter_Set_List.values())];
+        for parameter_Set in parameter_Set_List:
+            for name in parameter_Set.keys():
+                if not name in parameter_Key_Dict.keys():
+                    raise ValueError("'" + str(name) + "' is not a parameter name. Use one of " + ", ".join(parameter_Key_Dict.keys()) + ".");
+
+        #'(parameter sets,)' arrays of every parameter.
+        parameter_Array_Dict = {
+            key: np.array([parameter_Set.get(name, self.parameter_Dict[key]) for parameter_Set in parameter_Set_List], dtype=self.dtype)
+            for name, key in parameter_Key_Dict.items()
+            };
+        structure_Dict = self.Sweep_Structure_Generate(
+            word_to_Word = np.any(parameter_Array_Dict[("Weight", "Word_to_Word")] != 0),
+            feedback = any([np.any(parameter_Array_Dict[("Feedback", x)] != 0) for x in ["Word_to_Diphone_Activation", "Word_to_SPhone_Activation", "Word_to_Diphone_Inhibition", "Word_to_SPhone_Inhibition"]])
+            );
+
+        #Row 'set_Index * len(pronunciation_List) + pronunciation_Index'
+        row_Set_Index_Array = np.repeat(np.arange(len(parameter_Set_List)), len(pronunciation_List));
+        row_Pronunciation_Index_Array = np.tile(np.arange(len(pronunciation_List)), len(parameter_Set_List));
+        rt_Array = np.zeros(shape=(len(row_Set_Index_Array), 3)) + np.nan;
+
+        start_Time = time.time();
+        for batch_Index in range(0, len(row_Set_Index_Array), batch_Size):
+            batch_Set_Index_Array = row_Set_Index_Array[batch_Index:batch_Index + batch_Size];
+            batch_Pronunciation_List = [pronunciation_List[x] for x in row_Pronunciation_Index_Array[batch_Index:batch_Index + batch_Size]];
+            row_Parameter_Dict = {key: parameter_Array[batch_Set_Index_Array][:, None] for key, parameter_Array in parameter_Array_Dict.items()};
+            rt_Array[batch_Index:batch_Index + batch_Size] = self.RT_Multi_Run(batch_Pronunciation_List, absolute_Acc_Criteria, relative_Acc_Criteria, time_Acc_Criteria, structure_Dict, row_Parameter_Dict);
+        print("Simulation time: " + str(round(time.time() - start_Time, 3)) + "s");
+
+        result_List = [];
+        for set_Index, parameter_Set in enumerate(parameter_Set_List):
+            result_Dict = {name: parameter_Set.get(name, self.parameter_Dict[key]) for name, key in parameter_Key_Dict.items()};
+            set_RT_Array = rt_Array[set_Index * len(pronunciation_List):(set_Index + 1) * len(pronunciation_List)];
+            summary_List = self.RT_Summary_Generate(set_RT_Array[:, 0], set_RT_Array[:, 1], set_RT_Array[:, 2]);
+            for summary_Name, summary in zip(["RT_Absolute", "ACC_Absolute", "RT_Relative", "ACC_Relative", "RT_Time_Dependent", "ACC_Time_Dependent"], summary_List):
+                result_Dict[summary_Name] = summary;
+            result_List.append(result_Dict);
+
+        if not output_File_Name is None:
+            column_List = list(result_List[0].keys()) if len(result_List) > 0 else [];
+            output_Sweep_Data = ["\t".join(column_List)];
+            for result_Dict in result_List:
+                output_Sweep_Data.append("\t".join([str(result_Dict[column]) for column in column_List]));
+            with open(output_File_Name + "_Parameter_Sweep.txt", "w") as fileStream:
+                fileStream.write("\n".join(output_Sweep_Data));
+
+        return result_List;
+
+    def Unit_Name_List(self, layer_Name):
+        if layer_Name == "Phoneme":
+            return [[phoneme, location] for location in range(self.parameter_Dict["time_Slots"]) for phoneme in self.phoneme_List];
+        elif layer_Name == "Diphone":
+            return list(self.diphone_List);
+        elif layer_Name == "Single_Phone":
+            return list(self.single_Phone_List);
+        elif layer_Name == "Word":
+            return list(self.word_List);
+        raise ValueError("'" + str(layer_Name) + "' is not a layer name. Use 'Phoneme', 'Diphone', 'Single_Phone', or 'Word'.");
+
+    def Binary_Data_Open(self, index_File_Name, target_List, layer_File_Unit_List):
+        """
+        Create one '.npy' file per layer and the index file which is read by 'Activation_Data_Reader'.
+
+        Parameters
+        ----------
+        index_File_Name : string
+            The path of the index file.
+
+        target_List : list of string or string list
+            The inserted pronunciations. The first axis of each '.npy' file follows this order.
+
+        layer_File_Unit_List : list of tuple
+            An item is '(layer name, '.npy' file path, unit name list)'. The last axis of the '.npy' file follows the order of the unit name list.
+
+        Returns
+        -------
+        out : list of numpy.memmap
+            The writable arrays. The shape is '(len(target_List), cycles, units)'.
+
+        """
+        total_Cycle = self.parameter_Dict["time_Slots"] * self.parameter_Dict["iStep"];
+        index_Directory = os.path.dirname(os.path.abspath(index_File_Name));
+
+        index_Dict = {
+            "targets": [target if isinstance(target, str) else list(target) for target in target_List],
+            "cycles": total_Cycle,
+            "dtype": self.dtype.name,
+            "layers": {}
+            };
+        memmap_List = [];
+        for layer_Name, data_File_Name, unit_Name_List in layer_File_Unit_List:
+            memmap_List.append(np.lib.format.open_memmap(data_File_Name, mode="w+", dtype=self.dtype, shape=(len(target_List), total_Cycle, len(unit_Name_List))));
+            index_Dict["layers"][layer_Name] = {
+                "file": os.path.relpath(os.path.abspath(data_File_Name), index_Directory),
+                "units": unit_Name_List
+                };
+
+        with open(index_File_Name, "w") as f:
+            json.dump(index_Dict, f);
+
+        return memmap_List;
+
+    def Raw_Data_Text_Generate(self, pronunciation, phoneme_Activation_Array, diphone_Activation_Array, single_Phone_Activation_Array, word_Activation_Array):
+        phoneme_Text_List = [];
+        for phoneme in sorted(self.phoneme_List):
+            for location in range(self.parameter_Dict["time_Slots"]):
+                phoneme_Index = self.phoneme_Amount * location + self.phoneme_List.index(phoneme);
+                phoneme_Text_List.append(pronunciation + "\t" + phoneme + "\t" + str(location) + "\t" + "\t".join([str(x) for x in phoneme_Activation_Array[:,phoneme_Index]]) + "\n");
+
+        diphone_Text_List = [];
+        for diphone in sorted(self.diphone_List):
+            diphone_Index = self.diphone_Index_Dict[diphone];
+            diphone_Text_List.append(pronunciation + "\t" + diphone + "\t" + "\t".join([str(x) for x in diphone_Activation_Array[:,diphone_Index]]) + "\n");
+
+        single_Phone_Text_List = [];
+        for single_Phone in sorted(self.single_Phone_List):
+            single_Phone_Index = self.single_Phone_List.index(single_Phone);
+            single_Phone_Text_List.append(pronunciation + "\t" + single_Phone + "\t" + "\t".join([str(x) for x in single_Phone_Activation_Array[:,single_Phone_Index]]) + "\n");
+
+        word_Text_List = [];
+        for word in sorted(self.word_List):
+            word_Index = self.word_Index_Dict[word];
+            word_Text_List.append(pronunciation + "\t" + word + "\t" + "\t".join([str(x) for x in word_Activation_Array[:,word_Index]]) + "\n");
+
+        return "".join(phoneme_Text_List), "".join(diphone_Text_List), "".join(single_Phone_Text_List), "".join(word_Text_List);
+
+    def Category_Text_Generate(self, pronunciation, category_Mean_Array):
+        output_Category_Activation_Average_Data = [];
+        for category, category_Mean in zip(["Target", "Cohort", "Rhyme", "Embedding", "Other"], category_Mean_Array):
+            output_Category_Activation_Average_Data.append(pronunciation + "\t" + category + "\t" + "\t".join([str(x) for x in category_Mean]) + "\n");
+
+        return "".join(output_Category_Activation_Average_Data);
+
+    def Category_Mean_Generate(self, pronunciation_List, word_Activation_Array):
+        """
+        Calculate the average activation of the target, cohort, rhyme, embedding, and other words of each pronunciation.
+        The other words are not visited: their sum is the sum of all words minus the sum of the other categories. So the result can differ from averaging the words one by one by floating point rounding.
 
-        for word in self.word_List:
-            if pronunciation == word:
+        Parameters
+        ----------
+        pronunciation_List : list of string
+            The list or pronunciations.
+
+        word_Activation_Array : ndarray
+            The word activation of the pronunciations. The shape is '(len(pronunciation_List), cycles, words)', like the last result of 'Multi_Run'.
+
+        Returns
+        -------
+        out : ndarray
+            The shape is '(len(pronunciation_List), 5, cycles)'. The second dimension is target, cohort, rhyme, embedding, and other. An empty category is zero.
+
+        """
+        self.Category_Index_Build();
+        column_Array = self.category_Index_Dict["Column"];
+
+        #The target, cohort, rhyme, and embedding words, and their union, of all pronunciations are gathered at once.
+        category_Sum_Array = np.zeros(shape=(len(pronunciation_List), 5, word_Activation_Array.shape[1]), dtype=word_Activation_Array.dtype);
+        category_Count_Array = np.zeros(shape=(len(pronunciation_List), 5), dtype=np.int64);
+        category_Position_Array_List_List = [self.Category_Position_Generate(pronunciation) for pronunciation in pronunciation_List];
+        for category_Index in range(5):
+            position_Array_List = [category_Position_Array_List[category_Index] for category_Position_Array_List in category_Position_Array_List_List];
+            category_Count_Array[:, category_Index] = [len(position_Array) for position_Array in position_Array_List];
+            batch_Index_Array = np.repeat(np.arange(len(pronunciation_List)), category_Count_Array[:, category_Index]);
+            if len(batch_Index_Array) == 0:
                 continue;
-            if pronunciation[0:2] == word[0:2]:
-                cohort_List.append(word);
-            if pronunciation[1:] == word[1:] and pronunciation[0] != word[0]:
-                rhyme_List.append(word);
-            if word in pronunciation:
-                embedding_List.append(word);
-            if pronunciation != word and not word in cohort_List and not word in rhyme_List and not word in embedding_List:
-                other_List.append(word);
+            np.add.at(category_Sum_Array[:, category_Index], batch_Index_Array, word_Activation_Array[batch_Index_Array, :, column_Array[np.concatenate(position_Array_List)]]);
+
+        #Other = all words - the union of the categories. A word which is in the list twice is counted twice, like the other categories.
+        category_Sum_Array[:, 4] = word_Activation_Array @ self.category_Index_Dict["Column_Count"].astype(word_Activation_Array.dtype) - category_Sum_Array[:, 4];
+        category_Count_Array[:, 4] = self.word_Amount - category_Count_Array[:, 4];
+
+        return category_Sum_Array / np.maximum(category_Count_Array, 1)[:, :, None];
+
+    def Category_Index_Build(self):
+        #Tables from the word list to the word positions. They are made once per lexicon, so finding the categories of a pronunciation does not scan the lexicon.
+        if not self.category_Index_Dict is None:
+            return;
+
+        prefix_Dict = {};   #First two phonemes -> positions
+        suffix_Dict = {};   #All phonemes except the first -> positions
+        for position, word in enumerate(self.word_List):
+            prefix_Dict.setdefault(word[0:2], []).append(position);
+            suffix_Dict.setdefault(word[1:], []).append(position);
+
+        column_Array = np.array([self.word_Index_Dict[word] for word in self.word_List], dtype=np.int64);   #The activation column of each position. Same to 'self.word_List.index()'
+        self.category_Index_Dict = {
+            "Prefix": {key: np.array(value, dtype=np.int64) for key, value in prefix_Dict.items()},
+            "Suffix": {key: np.array(value, dtype=np.int64) for key, value in suffix_Dict.items()},
+            "Word_Position": {},    #Word -> every position of the word. It is used as the substring index of the embedding words.
+            "First_Phoneme": np.array([word[0:1] for word in self.word_List]),
+            "Column": column_Array,
+            "Column_Count": np.bincount(column_Array, minlength=self.word_Amount),   #How many positions use each activation column
+            "Pronunciation": {}     #Pronunciation -> the result of 'Category_Position_Generate'
+            };
+        for position, word in enumerate(self.word_List):
+            self.category_Index_Dict["Word_Position"].setdefault(word, []).append(position);
+
+    def Category_Position_Generate(self, pronunciation):
+        #The positions in 'self.word_List' of the target, cohort, rhyme, and embedding words, and the union of them. The positions are in the order of 'self.word_List'.
+        #The other words are not listed, so the cost does not depend on the lexicon size. The result is kept per pronunciation.
+        self.Category_Index_Build();
+        pronunciation_Dict = self.category_Index_Dict["Pronunciation"];
+        if pronunciation in pronunciation_Dict.keys():
+            return pronunciation_Dict[pronunciation];
+
+        empty_Array = np.zeros(0, dtype=np.int64);
+        word_Position_Dict = self.category_Index_Dict["Word_Position"];
+
+        target_Array = np.array(word_Position_Dict.get(pronunciation, []), dtype=np.int64);
+        cohort_Array = self.category_Index_Dict["Prefix"].get(pronunciation[0:2], empty_Array);
+        rhyme_Array = self.category_Index_Dict["Suffix"].get(pronunciation[1:], empty_Array);
+        rhyme_Array = rhyme_Array[self.category_Index_Dict["First_Phoneme"][rhyme_Array] != pronunciation[0]];
+        embedding_Array = np.array(sorted(set([
+            position
+            for start_Index in range(len(pronunciation))
+            for end_Index in range(start_Index + 1, len(pronunciation) + 1)
+            for position in word_Position_Dict.get(pronunciation[start_Index:end_Index], [])
+            ])), dtype=np.int64);
+
+        cohort_Array = cohort_Array[~np.isin(cohort_Array, target_Array)];
+        rhyme_Array = rhyme_Array[~np.isin(rhyme_Array, target_Array)];
+        embedding_Array = embedding_Array[~np.isin(embedding_Array, target_Array)];
+        union_Array = np.unique(np.concatenate([target_Array, cohort_Array, rhyme_Array, embedding_Array]));
+
+        pronunciation_Dict[pronunciation] = (target_Array, cohort_Array, rhyme_Array, embedding_Array, union_Array);
+        return pronunciation_Dict[pronunciation];
+
+    def Category_Index_Generate(self, pronunciation):
+        #The positions in 'self.word_List' of the target, cohort, rhyme, embedding, and other words. The positions are in the order of 'self.word_List'.
+        target_Array, cohort_Array, rhyme_Array, embedding_Array, union_Array = self.Category_Position_Generate(pronunciation);
+        category_Mask = np.ones(self.word_Amount, dtype=bool);
+        category_Mask[union_Array] = False;
+        other_Array = np.nonzero(category_Mask)[0];
+
+        return target_Array, cohort_Array, rhyme_Array, embedding_Array, other_Array;
+
+    def Category_Count_Generate(self, pronunciation):
+        #The numbers of the target, cohort, rhyme, embedding, and other words.
+        category_Position_Array_List = self.Category_Position_Generate(pronunciation);
+        return np.array([len(position_Array) for position_Array in category_Position_Array_List[:4]] + [self.word_Amount - len(category_Position_Array_List[4])], dtype=np.int64);
 
-        return cohort_List, rhyme_List, embedding_List, other_List;
+    def Category_List(self, pronunciation):
+        return tuple([[self.word_List[position] for position in category_Array] for category_Array in self.Category_Index_Generate(pronunciation)[1:]]);
 
     def Display_Mean_Category_Count(self, pronunciation_List):
-        cohort_Count_List = [];
-        rhyme_Count_List = [];
-        embedding_Count_List = [];
-        other_Count_List = [];
-
-        for pronunciation in pronunciation_List:
-            cohort_List, rhyme_List, embedding_List, other_List = self.Category_List(pronunciation);
-            cohort_Count_List.append(len(cohort_List));
-            rhyme_Count_List.append(len(rhyme_List));
-            embedding_Count_List.append(len(embedding_List));
-            other_Count_List.append(len(other_List));
-
-        print("Mean cohort count:", np.mean(cohort_Count_List));
-        print("Mean rhyme count:", np.mean(rhyme_Count_List));
-        print("Mean embedding count:", np.mean(embedding_Count_List));
-        print("Mean other count:", np.mean(other_Count_List));
+        category_Count_Array = np.array([self.Category_Count_Generate(pronunciation)[1:] for pronunciation in pronunciation_List]);
+
+        print("Mean cohort count:", np.mean(category_Count_Array[:, 0]));
+        print("Mean rhyme count:", np.mean(category_Count_Array[:, 1]));
+        print("Mean embedding count:", np.mean(category_Count_Array[:, 2]));
+        print("Mean other count:", np.mean(category_Count_Array[:, 3]));
+
+    def Diphone_Index(self, diphone):
+        if diphone in self.diphone_Index_Dict:
+            return self.diphone_Index_Dict[diphone];
+        if self.prune_Diphone and len(diphone) == 2 and all([phoneme in self.phoneme_Index_Dict for phoneme in diphone]):
+            raise ValueError("'" + str(diphone) + "' is not an open diphone of any word, so it is not in the pruned diphone layer. Construct the model with 'prune_Diphone = False' to see it.");
+        raise ValueError("'" + str(diphone) + "' is not a diphone of the model.");
 
     def Display_Graph(self, pronunciation, activation_Ratio_Dict = {}, display_Phoneme_List = None, display_Diphone_List = None, display_Single_Phone_List = None, display_Word_List = None, file_Save = False):
         """
@@ -653,6 +1971,7 @@ class TISK_Model:
 
         """
 
+        plt = Pyplot_Import();
 
         marker_list = [",", "o", "v", "^", "<", ">", "1", "2", "3", "4", "s", "p", "*", "h", "H", "+", "x", "D", "d", "|", "_"];
 
@@ -685,7 +2004,7 @@ class TISK_Model:
         if not display_Diphone_List is None:
             activation_List = [];
             for display_Diphone in display_Diphone_List:
-                diphone_Index = self.diphone_List.index(display_Diphone);
+                diphone_Index = self.Diphone_Index(display_Diphone);
                 activation_List.append(diphone_Activation_Array[:,diphone_Index]);
 
             display_Data = np.zeros(shape=(len(activation_List), self.parameter_Dict["time_Slots"] * self.parameter_Dict["iStep"]));
@@ -750,7 +2069,7 @@ class TISK_Model:
 
         plt.show(block=False);
 
-    def Extract_Data(self, pronunciation, activation_Ratio_Dict = {}, extract_Phoneme_List = None, extract_Diphone_List = None, extract_Single_Phone_List = None, extract_Word_List = None, file_Save = False):
+    def Extract_Data(self, pronunciation, activation_Ratio_Dict = {}, extract_Phoneme_List = None, extract_Diphone_List = None, extract_Single_Phone_List = None, extract_Word_List = None, file_Save = False, file_Format = "text"):
         """
         Export the activation result about selected representations in inserted pronunciation simulation.
 
@@ -777,6 +2096,9 @@ class TISK_Model:
         file_Save: bool, optional
             If this parameter is 'True', the activation pattern of the representations which you select will be exported.
 
+        file_Format : string, optional
+            The format of the exported files. 'text' or 'npy'. If this parameter is 'npy', the activation pattern of each layer is exported as one '.npy' file whose shape is '(1, cycles, representations)', with an index file '<pronunciation>.Index.json'. Use 'Activation_Data_Reader' to read them.
+
         Returns
         -------
         out : list of ndarray
@@ -784,11 +2106,19 @@ class TISK_Model:
 
         """
 
+        if not file_Format in ["text", "npy"]:
+            raise ValueError("'" + str(file_Format) + "' is not a file format. Use 'text' or 'npy'.");
+
         start_Time = time.time();
-        phoneme_Activation_Array, diphone_Activation_Array, single_Phone_Activation_Array, word_Activation_Array = self.Run(pronunciation, activation_Ratio_Dict);
+        phoneme_Activation_Array, diphone_Activation_Array, single_Phone_Activation_Array, word_Activation_Array = self.Run(
+            pronunciation,
+            activation_Ratio_Dict,
+            layer_List = [layer_Name for layer_Name, extract_List in zip(["Phoneme", "Diphone", "Single_Phone", "Word"], [extract_Phoneme_List, extract_Diphone_List, extract_Single_Phone_List, extract_Word_List]) if not extract_List is None]     #Only the extracted layers are recorded.
+            );
         print("Simulation time: " + str(round(time.time() - start_Time, 3)) + "s");
 
         result_Array = [];
+        binary_Layer_List = [];
 
         if not extract_Phoneme_List is None:
             activation_List = [];
@@ -796,8 +2126,9 @@ class TISK_Model:
                 phoneme_Index = self.phoneme_List.index(extract_Phoneme[0]) + (extract_Phoneme[1] * len(self.phoneme_List));
                 activation_List.append(phoneme_Activation_Array[:,phoneme_Index]);
             result_Array.append(np.vstack(activation_List));
+            binary_Layer_List.append(("Phoneme", [[extract_Phoneme[0], extract_Phoneme[1]] for extract_Phoneme in extract_Phoneme_List], result_Array[-1]));
 
-            if file_Save:
+            if file_Save and file_Format == "text":
                 with open("_".join(pronunciation) + ".Phoneme.txt", "w") as f:
                     extract_Text = ["Target\tPhoneme\t" + "\t".join([str(x) for x in range(0,self.parameter_Dict["time_Slots"] * self.parameter_Dict["iStep"])]) + "\n"];
                     for index in range(len(extract_Phoneme_List)):
@@ -809,11 +2140,12 @@ class TISK_Model:
         if not extract_Diphone_List is None:
             activation_List = [];
             for extract_Diphone in extract_Diphone_List:
-                diphone_Index = self.diphone_List.index(extract_Diphone);
+                diphone_Index = self.Diphone_Index(extract_Diphone);
                 activation_List.append(diphone_Activation_Array[:,diphone_Index]);
             result_Array.append(np.vstack(activation_List));
+            binary_Layer_List.append(("Diphone", list(extract_Diphone_List), result_Array[-1]));
 
-            if file_Save:
+            if file_Save and file_Format == "text":
                 with open("_".join(pronunciation) + ".Diphone.txt", "w") as f:
                     extract_Text = ["Target\tDiphone\t" + "\t".join([str(x) for x in range(0,self.parameter_Dict["time_Slots"] * self.parameter_Dict["iStep"])]) + "\n"];
                     for index in range(len(extract_Diphone_List)):
@@ -828,8 +2160,9 @@ class TISK_Model:
                 single_Phone_Index = self.single_Phone_List.index(extract_Single_Phone);
                 activation_List.append(single_Phone_Activation_Array[:,single_Phone_Index]);
             result_Array.append(np.vstack(activation_List));
+            binary_Layer_List.append(("Single_Phone", list(extract_Single_Phone_List), result_Array[-1]));
 
-            if file_Save:
+            if file_Save and file_Format == "text":
                 with open("_".join(pronunciation) + ".Single_Phone.txt", "w") as f:
                     extract_Text = ["Target\tSingle_Phone\t" + "\t".join([str(x) for x in range(0,self.parameter_Dict["time_Slots"] * self.parameter_Dict["iStep"])]) + "\n"];
                     for index in range(len(extract_Single_Phone_List)):
@@ -844,8 +2177,9 @@ class TISK_Model:
                 word_Index = self.word_List.index(extract_Word);
                 activation_List.append(word_Activation_Array[:,word_Index]);
             result_Array.append(np.vstack(activation_List));
+            binary_Layer_List.append(("Word", list(extract_Word_List), result_Array[-1]));
 
-            if file_Save:
+            if file_Save and file_Format == "text":
                 with open("_".join(pronunciation) + ".Word.txt", "w") as f:
                     extract_Text = ["Target\tWord\t" + "\t".join([str(x) for x in range(0,self.parameter_Dict["time_Slots"] * self.parameter_Dict["iStep"])]) + "\n"];
                     for index in range(len(extract_Word_List)):
@@ -854,9 +2188,19 @@ class TISK_Model:
                         extract_Text.append("\n");
                     f.write("".join(extract_Text));
 
+        if file_Save and file_Format == "npy":
+            memmap_List = self.Binary_Data_Open(
+                "_".join(pronunciation) + ".Index.json",
+                [pronunciation],
+                [(layer_Name, "_".join(pronunciation) + "." + layer_Name + ".npy", unit_Name_List) for layer_Name, unit_Name_List, _ in binary_Layer_List]
+                );
+            for memmap, (_, _, activation_Array) in zip(memmap_List, binary_Layer_List):
+                memmap[0] = activation_Array.T;
+                memmap.flush();
+
         return result_Array;
 
-    def Average_Activation_by_Category_Graph(self, pronunciation_List, file_Save = False, output_File_Name = "Average_Activation_by_Category_Graph.png", batch_Size=100):
+    def Average_Activation_by_Category_Graph(self, pronunciation_List, file_Save = False, output_File_Name = "Average_Activation_by_Category_Graph.png", batch_Size=100, workers=1):
         """
         Export the categorized average graph about all pronunciations of inserted list.
 
@@ -874,64 +2218,44 @@ class TISK_Model:
         batch_Size : int, optional
             How many words are simulated at one time. This parameter does not affect the reusult. However, the larger value, the faster processing speed, but the more memory required. If a 'memory error' occurs, reduce the size of this parameter because it means that you can not afford to load into the machine's memory.
 
+
+        workers : int, optional
+            Same as 'Run_List'.
+
         """
 
+        plt = Pyplot_Import();
         spent_Time_List = [];
 
         marker_list = [",", "o", "v", "^", "<", ">", "1", "2", "3", "4", "s", "p", "*", "h", "H", "+", "x", "D", "d", "|", "_"];
 
-        target_Activation_List = [];
-        cohort_Activation_List = [];
-        rhyme_Activation_List = [];
-        embedding_Activation_List = [];
-        other_Activation_List = [];
+        #Sum and count of the activations of each category. They are accumulated per pronunciation, so the activations of the whole list are not kept.
+        category_Sum_Array = np.zeros(shape=(5, self.parameter_Dict["time_Slots"] * self.parameter_Dict["iStep"]));     #Target, cohort, rhyme, embedding, and other
+        category_Count_Array = np.zeros(5, dtype=np.int64);
 
-        for batch_Index in range(0, len(pronunciation_List), batch_Size):
+        result_Generator = self.Run_List_Generator(pronunciation_List, batch_Size=batch_Size, layer_List=["Category"], workers=workers);    #The category averages are calculated once per batch.
+        while True:
             start_Time = time.time();
-            batch_Word_Activation_Array = self.Multi_Run(pronunciation_List[batch_Index:batch_Index + batch_Size])[3];
+            try:
+                _, pronunciation, _, _, _, (category_Mean_Array,) = next(result_Generator);
+            except StopIteration:
+                break;
             spent_Time_List.append(time.time() - start_Time);
 
-            for pronunciation_Index in range(min(len(pronunciation_List) - batch_Index, batch_Size)):
-                pronunciation = pronunciation_List[batch_Index + pronunciation_Index];
-                word_Activation_Array = batch_Word_Activation_Array[pronunciation_Index]
-
-                cohort_List, rhyme_List, embedding_List, other_List = self.Category_List(pronunciation);
-
-                target_Activation_List.append(word_Activation_Array[:, [self.word_List.index(pronunciation)]]);
-                if len(cohort_List) > 0:
-                    cohort_Activation_List.append(word_Activation_Array[:, [self.word_List.index(cohort) for cohort in cohort_List]]);
-                if len(rhyme_List) > 0:
-                    rhyme_Activation_List.append(word_Activation_Array[:, [self.word_List.index(rhyme) for rhyme in rhyme_List]]);
-                if len(embedding_List) > 0:
-                    embedding_Activation_List.append(word_Activation_Array[:, [self.word_List.index(embedding) for embedding in embedding_List]]);
-                if len(other_List) > 0:
-                    other_Activation_List.append(word_Activation_Array[:, [self.word_List.index(other) for other in other_List]]);
+            with self.Profile("Categorization"):
+                category_Count = self.Category_Count_Generate(pronunciation);
+                category_Sum_Array += category_Mean_Array * category_Count[:, None];
+                category_Count_Array += category_Count;
 
         print("Simulation time: " + str(round(np.sum(spent_Time_List), 3)) + "s");
         print("Simulation time per one word: " + str(round(np.sum(spent_Time_List) / len(pronunciation_List), 3)) + "s");
 
         display_Data_List = [];
         display_Category_List = [];
-
-        if len(target_Activation_List) > 0:
-            display_Data_List.append(np.mean(np.hstack(target_Activation_List), axis=1));
-            display_Category_List.append("Target");
-
-        if len(cohort_Activation_List) > 0:
-            display_Data_List.append(np.mean(np.hstack(cohort_Activation_List), axis=1));
-            display_Category_List.append("Cohort");
-
-        if len(rhyme_Activation_List) > 0:
-            display_Data_List.append(np.mean(np.hstack(rhyme_Activation_List), axis=1));
-            display_Category_List.append("Rhyme");
-
-        if len(embedding_Activation_List) > 0:
-            display_Data_List.append(np.mean(np.hstack(embedding_Activation_List), axis=1));
-            display_Category_List.append("Embedding");
-
-        if len(other_Activation_List) > 0:
-            display_Data_List.append(np.mean(np.hstack(other_Activation_List), axis=1));
-            display_Category_List.append("Other");
+        for category_Index, category in enumerate(["Target", "Cohort", "Rhyme", "Embedding", "Other"]):
+            if category_Count_Array[category_Index] > 0:
+                display_Data_List.append(category_Sum_Array[category_Index] / category_Count_Array[category_Index]);
+                display_Category_List.append(category);
 
         fig = plt.figure(figsize=(8, 8));
         for y_arr, label, marker in zip(display_Data_List, display_Category_List, marker_list[0:len(display_Category_List)]):
@@ -947,6 +2271,371 @@ class TISK_Model:
 
         plt.show(block=False);
 
+def Array_File_Save(directory, name, value):
+    #Save a dense array as one '.npy' file, and a sparse matrix as three '.npy' files of its CSR parts. The returned description is used by 'Array_File_Load'. 'None' means that the value is not an array.
+    if isinstance(value, np.ndarray):
+        np.save(os.path.join(directory, name + ".npy"), value);
+        return ["dense", name + ".npy"];
+
+    if hasattr(value, "tocsr"):     #scipy sparse matrix. scipy is not imported when 'sparse_Weight' is not used.
+        value = value.tocsr();
+        file_Name_List = [];
+        for part_Name, part_Array in [("data", value.data), ("indices", value.indices), ("indptr", value.indptr)]:
+            file_Name_List.append(name + "." + part_Name + ".npy");
+            np.save(os.path.join(directory, file_Name_List[-1]), part_Array);
+        return ["sparse", file_Name_List, list(value.shape)];
+
+    return None;
+
+def Array_File_Load(directory, array_File, mmap_Mode = "r"):
+    if array_File[0] == "dense":
+        return np.load(os.path.join(directory, array_File[1]), mmap_mode=mmap_Mode);
+
+    import scipy.sparse as sparse;
+    data, indices, indptr = [np.load(os.path.join(directory, file_Name), mmap_mode=mmap_Mode) for file_Name in array_File[1]];
+    return sparse.csr_matrix((data, indices, indptr), shape=tuple(array_File[2]), copy=False);
+
+worker_Model = None;
+
+def Pool_Worker_Initialize(model_State, directory, array_File_Dict):
+    global worker_Model;
+
+    worker_Model = TISK_Model.__new__(TISK_Model);
+    worker_Model.__dict__.update(model_State);
+    for name, array_File in array_File_Dict.items():
+        setattr(worker_Model, name, Array_File_Load(directory, array_File));
+
+def Pool_Worker_Run(argument):
+    return worker_Model.Run_List_Batch(*argument);
+
+class TISK_Profiler:
+    def __init__(self, callback = None, count_Active_Units = True, trace_Memory = False):
+        """
+        Record where the time of a model goes. Assign it by 'TISK_Model.Profiler_Assign', and read the result by 'Stats'.
+
+        Parameters
+        ----------
+        callback : function, optional
+            If this parameter is assigned, it is called as 'callback(kind, name, value)' whenever something is recorded. 'kind' is 'Timing' (the seconds of one phase), 'Counter', or 'Batch' (the dict of one batch of 'Run_List').
+
+        count_Active_Units : bool, optional
+            If this parameter is 'True', the nonzero units of each layer are counted at every cycle. The counting takes a little time per cycle.
+
+        trace_Memory : bool, optional
+            If this parameter is 'True', the peak memory of each batch of 'Run_List' is measured by 'tracemalloc'. 'tracemalloc' makes the simulation slower.
+
+        """
+        self.callback = callback;
+        self.count_Active_Units = count_Active_Units;
+        self.trace_Memory = trace_Memory;
+        self.Reset();
+
+    def Reset(self):
+        self.timing_Dict = {};  #Phase -> [count, total seconds, max seconds]
+        self.counter_Dict = {};
+        self.active_Unit_Dict = {};     #Layer -> the nonzero units at each cycle, summed over the simulated pronunciations
+        self.active_Row_Array = np.zeros(0, dtype=np.int64);    #The simulated pronunciations at each cycle
+        self.batch_List = [];
+
+    @contextlib.contextmanager
+    def Phase(self, phase):
+        start_Time = time.perf_counter();
+        try:
+            yield;
+        finally:
+            self.Timing_Add(phase, time.perf_counter() - start_Time);
+
+    def Timing_Add(self, phase, spent_Time):
+        timing = self.timing_Dict.setdefault(phase, [0, 0.0, 0.0]);
+        timing[0] += 1;
+        timing[1] += spent_Time;
+        timing[2] = max(timing[2], spent_Time);
+        if not self.callback is None:
+            self.callback("Timing", phase, spent_Time);
+
+    def Count(self, name, value = 1):
+        self.counter_Dict[name] = self.counter_Dict.get(name, 0) + value;
+        if not self.callback is None:
+            self.callback("Counter", name, value);
+
+    def Active_Unit_Add(self, cycle, layer_Activation_List):
+        #'layer_Activation_List' is the phoneme, diphone, single phone, and word activation of a batch at 'cycle'.
+        self.Count("Simulated_Cycle", len(layer_Activation_List[0]));
+        if not self.count_Active_Units:
+            return;
+        if len(self.active_Row_Array) <= cycle:
+            self.active_Row_Array = np.concatenate([self.active_Row_Array, np.zeros(cycle + 1 - len(self.active_Row_Array), dtype=np.int64)]);
+        self.active_Row_Array[cycle] += len(layer_Activation_List[0]);
+        for layer_Name, layer_Activation in zip(["Phoneme", "Diphone", "Single_Phone", "Word"], layer_Activation_List):
+            active_Unit_Array = self.active_Unit_Dict.get(layer_Name, np.zeros(0, dtype=np.int64));
+            if len(active_Unit_Array) <= cycle:
+                active_Unit_Array = np.concatenate([active_Unit_Array, np.zeros(cycle + 1 - len(active_Unit_Array), dtype=np.int64)]);
+                self.active_Unit_Dict[layer_Name] = active_Unit_Array;
+            active_Unit_Array[cycle] += np.count_nonzero(layer_Activation);
+
+    def Memory_Trace_Start(self):
+        #Return whether the tracing was started here. If 'tracemalloc' is already tracing, only its peak is reset.
+        if not self.trace_Memory:
+            return False;
+        import tracemalloc;
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak();
+            return False;
+        tracemalloc.start();
+        return True;
+
+    def Memory_Trace_Stop(self, trace_Started):
+        if not self.trace_Memory:
+            return None;
+        import tracemalloc;
+        peak_Memory = tracemalloc.get_traced_memory()[1];
+        if trace_Started:
+            tracemalloc.stop();
+        return peak_Memory;
+
+    def Batch_Add(self, batch_Dict):
+        self.batch_List.append(batch_Dict);
+        self.Count("Batch");
+        self.Count("Simulated_Pronunciation", batch_Dict["Batch_Size"]);
+        if not self.callback is None:
+            self.callback("Batch", "Run_List_Batch", batch_Dict);
+
+    def Stats(self):
+        """
+        Return the recorded result.
+
+        Returns
+        -------
+        out : dict
+            'Timing': phase -> dict of 'Count', 'Total', 'Mean', and 'Max' seconds.
+            'Counter': name -> value. 'Simulated_Cycle' is the cycles multiplied by the pronunciations simulated in the cycles.
+            'Active_Unit': layer -> ndarray of the mean nonzero units per pronunciation at each cycle.
+            'Batch': list of dict of each batch of 'Run_List'. 'Batch_Size', 'Time' (seconds), 'Recorded_Bytes' (the activation patterns kept for the batch), and 'Peak_Bytes' (with 'trace_Memory', otherwise 'None').
+
+        """
+        return {
+            "Timing": {phase: {"Count": count, "Total": total, "Mean": total / count, "Max": maximum} for phase, (count, total, maximum) in self.timing_Dict.items()},
+            "Counter": dict(self.counter_Dict),
+            "Active_Unit": {layer_Name: active_Unit_Array / np.maximum(self.active_Row_Array, 1) for layer_Name, active_Unit_Array in self.active_Unit_Dict.items()},
+            "Batch": list(self.batch_List)
+            };
+
+class TISK_Simulation:
+    def __init__(self, tisk_Model, sliding_Window = False):
+        """
+        Keep the state of one simulation between calls, so the phonemes can be inserted one by one while they arrive.
+        Each 'Push_Phoneme' simulates only the 'iStep' cycles of the slot of the phoneme, and the word ranking can be read after every phoneme by 'Word_Ranking'.
+
+        Parameters
+        ----------
+        tisk_Model : TISK_Model
+            The initialized model. If the weights of the model are changed (for example, by 'Add_Words' or 'Weight_Initialize'), make a new simulation.
+
+        sliding_Window : bool, optional
+            If this parameter is 'True', the phoneme layer is a window of the last 'time_Slots' slots, and the input can be longer than 'time_Slots'.
+            When every slot is used, the oldest slot is recycled for the next phoneme: the window moves by one slot, so the slot weights and the gates of the remaining phonemes are relative to the new window.
+            The memory and the cost of a cycle do not depend on the length of the input.
+
+        """
+        self.tisk_Model = tisk_Model;
+        self.sliding_Window = sliding_Window;
+        self.stacked_WeightMatrix_Phoneme_to_Diphone = tisk_Model.Gated_Weight_Generate();
+        self.record_Spec = ([None, None, None, slice(None)], 1);   #Only the word layer is returned from 'Push_Phoneme' and 'Step'.
+        self.Reset();
+
+    def Reset(self):
+        self.layer_Activation_List, self.gate_Close_Slot_Array = self.tisk_Model.Layer_Initialize(1);
+        self.inserted_Phoneme_List = [];    #The phonemes in the slots of the window
+        self.slot_Index = 0;    #The slot of the next phoneme
+        self.window_Start = 0;  #The slots which were recycled by 'sliding_Window'
+        self.cycle = 0;     #The simulated cycles
+
+    def Window_Slide(self):
+        #The oldest slot leaves the window. The phoneme activation of the other slots moves to the previous slot, and the last slot becomes empty for the next phoneme.
+        #Because each slot is one slot earlier in the window now, the gates of a phoneme close after the first slot which still has the phoneme. If no slot has it, its gates are open again.
+        phoneme_Amount = self.tisk_Model.phoneme_Amount;
+        phoneme_Layer_Activation = self.layer_Activation_List[0];
+        self.layer_Activation_List[0] = np.hstack([phoneme_Layer_Activation[:, phoneme_Amount:], np.zeros(shape=(1, phoneme_Amount), dtype=phoneme_Layer_Activation.dtype)]);
+        self.inserted_Phoneme_List = self.inserted_Phoneme_List[1:];
+
+        self.gate_Close_Slot_Array = np.zeros(shape=(1, phoneme_Amount), dtype=np.int64) + self.tisk_Model.parameter_Dict["time_Slots"];
+        for slot_Index, phoneme in reversed(list(enumerate(self.inserted_Phoneme_List))):
+            self.gate_Close_Slot_Array[0, self.tisk_Model.phoneme_Index_Dict[phoneme]] = slot_Index;
+
+        self.slot_Index -= 1;
+        self.window_Start += 1;
+
+    def Cycle_Run(self, using_Pattern, inserted_Phoneme_Index, step_Count):
+        self.layer_Activation_List, self.gate_Close_Slot_Array, activation_Cycle_List = self.tisk_Model.Slot_Run(
+            self.layer_Activation_List,
+            self.gate_Close_Slot_Array,
+            using_Pattern,
+            np.array([inserted_Phoneme_Index], dtype=np.int64),
+            self.slot_Index,
+            self.stacked_WeightMatrix_Phoneme_to_Diphone,
+            self.record_Spec,
+            step_Count,
+            self.cycle
+            );
+        self.cycle += step_Count;
+
+        return np.array(activation_Cycle_List[3]).reshape(step_Count, self.tisk_Model.word_Amount);
+
+    def Push_Phoneme(self, phoneme):
+        """
+        Insert a phoneme to the next slot, and simulate the 'iStep' cycles of the slot. The gates of the phoneme are closed after the slot, same as 'Run'.
+        With 'sliding_Window', the window moves by one slot first if every slot is used.
+
+        Parameters
+        ----------
+        phoneme : string
+            The inserted phoneme.
+
+        Returns
+        -------
+        out : ndarray
+            The word activation of the simulated cycles. The shape is '(iStep, word count)'.
+
+        """
+        if not phoneme in self.tisk_Model.phoneme_Index_Dict:
+            raise ValueError("The phoneme '" + str(phoneme) + "' is not in the phoneme list.");
+        if self.slot_Index >= self.tisk_Model.parameter_Dict["time_Slots"]:
+            if not self.sliding_Window:
+                raise ValueError("Every time slot is already used. Make the model with more 'time_Slots', use 'sliding_Window', or 'Reset' the simulation.");
+            self.Window_Slide();
+
+        using_Pattern = self.tisk_Model.Pattern_Generate([[]] * self.slot_Index + [phoneme]);
+        word_Activation_Array = self.Cycle_Run(using_Pattern, self.tisk_Model.phoneme_Index_Dict[phoneme], self.tisk_Model.parameter_Dict["iStep"]);
+        self.inserted_Phoneme_List.append(phoneme);
+        self.slot_Index += 1;
+
+        return word_Activation_Array;
+
+    def Step(self, cycle_Count = None):
+        """
+        Simulate the cycles without any input, for example the silence after the last phoneme. The slot of the next phoneme is not changed.
+
+        Parameters
+        ----------
+        cycle_Count : int, optional
+            The simulated cycles. If this parameter is 'None', 'iStep' cycles are simulated.
+
+        Returns
+        -------
+        out : ndarray
+            The word activation of the simulated cycles. The shape is '(cycle_Count, word count)'.
+
+        """
+        cycle_Count = self.tisk_Model.parameter_Dict["iStep"] if cycle_Count is None else cycle_Count;
+        using_Pattern = np.zeros(shape=(1, self.tisk_Model.phoneme_Amount * self.tisk_Model.parameter_Dict["time_Slots"]), dtype=self.tisk_Model.dtype);
+
+        return self.Cycle_Run(using_Pattern, -1, cycle_Count);
+
+    def Snapshot(self):
+        """
+        Return the current activation of every layer.
+
+        Returns
+        -------
+        out : ndarrays
+            phoneme, diphone, single phone, and word activation. These are the copies of the last cycle, so they are same to the last rows of the matrices of 'Run' after the same input.
+
+        """
+        return tuple([layer_Activation[0].copy() for layer_Activation in self.layer_Activation_List]);
+
+    def Word_Ranking(self, top_Count = None):
+        """
+        Return the words sorted by their current activation.
+
+        Parameters
+        ----------
+        top_Count : int, optional
+            The number of the returned words. If this parameter is 'None', every word is returned.
+
+        Returns
+        -------
+        out : list of tuple
+            (word, activation) of each word. The words of same activation keep the order of 'word_List'.
+
+        """
+        word_Activation = self.layer_Activation_List[3][0];
+        rank_Index_Array = np.argsort(-word_Activation, kind="stable")[:top_Count];
+
+        return [(self.tisk_Model.word_List[word_Index], word_Activation[word_Index]) for word_Index in rank_Index_Array];
+
+class Activation_Data_Reader:
+    def __init__(self, index_File_Name):
+        """
+        Read the activation data exported with 'file_Format="npy"'. The '.npy' files are memory-mapped, so only the requested slices are read from the disk.
+
+        Parameters
+        ----------
+        index_File_Name : string
+            The index file. '<output_File_Name>_Activation_Data_Index.json' for 'Run_List', and '<pronunciation>.Index.json' for 'Extract_Data'.
+
+        """
+        with open(index_File_Name) as f:
+            index_Dict = json.load(f);
+        index_Directory = os.path.dirname(os.path.abspath(index_File_Name));
+
+        self.target_List = [target if isinstance(target, str) else tuple(target) for target in index_Dict["targets"]];
+        self.target_Index_Dict = {};
+        for index, target in enumerate(self.target_List):
+            self.target_Index_Dict.setdefault(target, index);
+
+        self.layer_List = list(index_Dict["layers"].keys());
+        self.unit_List_Dict = {};
+        self.unit_Index_Dict = {};
+        self.data_Dict = {};
+        for layer_Name, layer_Dict in index_Dict["layers"].items():
+            self.unit_List_Dict[layer_Name] = [unit if isinstance(unit, str) else tuple(unit) for unit in layer_Dict["units"]];
+            self.unit_Index_Dict[layer_Name] = {};
+            for index, unit in enumerate(self.unit_List_Dict[layer_Name]):
+                self.unit_Index_Dict[layer_Name].setdefault(unit, index);
+            self.data_Dict[layer_Name] = np.load(os.path.join(index_Directory, layer_Dict["file"]), mmap_mode="r");
+
+    def Get_Activation(self, layer_Name, target = None, unit_List = None):
+        """
+        Return the activation pattern of the selected target and units.
+
+        Parameters
+        ----------
+        layer_Name : string
+            'Phoneme', 'Diphone', 'Single_Phone', or 'Word'.
+
+        target : string or list of string, optional
+            The inserted pronunciation. If you do not set, all targets are returned.
+
+        unit_List : list, optional
+            The units. A phoneme unit is a tuple '(phoneme, location)', and the other units are strings. If you do not set, all units are returned.
+
+        Returns
+        -------
+        out : ndarray
+            The shape is '(cycles, units)' when 'target' is set, and '(targets, cycles, units)' otherwise.
+
+        """
+        if not layer_Name in self.data_Dict.keys():
+            raise ValueError("'" + str(layer_Name) + "' is not in the exported layers: " + ", ".join(self.layer_List));
+
+        data = self.data_Dict[layer_Name];
+        if not target is None:
+            target_Key = target if isinstance(target, str) else tuple(target);
+            if not target_Key in self.target_Index_Dict.keys():
+                raise ValueError("'" + str(target) + "' is not an exported target.");
+            data = data[self.target_Index_Dict[target_Key]];
+
+        if unit_List is None:
+            return np.asarray(data);
+
+        unit_Index_List = [];
+        for unit in unit_List:
+            unit_Key = unit if isinstance(unit, str) else tuple(unit);
+            if not unit_Key in self.unit_Index_Dict[layer_Name].keys():
+                raise ValueError("'" + str(unit) + "' is not an exported unit of the " + layer_Name + " layer.");
+            unit_Index_List.append(self.unit_Index_Dict[layer_Name][unit_Key]);
+        return np.asarray(data[..., unit_Index_List]);
+
 if __name__ == "__main__":
     # # Example
     # phoneme_List, word_List = List_Generate();
@@ -0,0 +1,278 @@
+﻿#########################################################
+# This code is a part of TISK 1.x Distribution by Heejo You.
+# This is not core file of TISK 1.x Distribution,
+# but it measures how the time and memory of TISK scale
+# with the size of the lexicon and the phoneme inventory.
+# For the detail meaning of each command,
+# see https://github.com/CODEJIN/Tisk or You & Magnuson (2018).
+#########################################################
+
+import argparse;
+import contextlib;
+import io;
+import json;
+import os;
+import platform;
+import string;
+import subprocess;
+import sys;
+import time;
+import tracemalloc;
+import numpy as np;
+import Basic_TISK_Class as tisk;
+
+#The length distribution of the original TRACE 212-word lexicon (Pronunciation_Data.txt)
+trace_Length_Distribution = {1: 1, 2: 14, 3: 75, 4: 65, 5: 31, 6: 15, 7: 8, 8: 2, 9: 1};
+phoneme_Symbol_List = list(string.ascii_lowercase + string.ascii_uppercase + string.digits);
+
+def Synthetic_Lexicon_Generate(phoneme_Count = 14, word_Count = 1000, length_Distribution = None, seed = 0):
+    """
+    Generate a random lexicon.
+
+    Parameters
+    ----------
+    phoneme_Count : int, optional
+        The size of the phoneme inventory. The phonemes are single characters ('a', 'b', ...), so this parameter should be between 1 and 62.
+
+    word_Count : int, optional
+        The number of words. Every word is different.
+
+    length_Distribution : dict, optional
+        The relative frequency of each word length. For example, '{3: 1, 4: 2}' makes twice as many four-phoneme words as three-phoneme words. If this parameter is 'None', the length distribution of the original TRACE lexicon is used.
+
+    seed : int, optional
+        The random seed. The same arguments and seed always give the same lexicon.
+
+    Returns
+    -------
+    out : list of string, list of string
+        The phoneme list and the word list, same as 'List_Generate'.
+
+    """
+    if phoneme_Count < 1 or phoneme_Count > len(phoneme_Symbol_List):
+        raise ValueError("'phoneme_Count' should be between 1 and " + str(len(phoneme_Symbol_List)) + ".");
+    if length_Distribution is None:
+        length_Distribution = trace_Length_Distribution;
+    length_Array = np.array(sorted(length_Distribution.keys()));
+    probability_Array = np.array([length_Distribution[length] for length in length_Array], dtype=np.float64);
+    probability_Array /= probability_Array.sum();
+    if sum([phoneme_Count ** int(length) for length in length_Array]) < word_Count:
+        raise ValueError("The phoneme inventory and the word lengths cannot make " + str(word_Count) + " different words.");
+
+    phoneme_List = phoneme_Symbol_List[:phoneme_Count];
+    random_State = np.random.RandomState(seed);
+    word_List = [];
+    word_Set = set();
+    while len(word_List) < word_Count:
+        length_Sample_Array = random_State.choice(length_Array, size=word_Count - len(word_List), p=probability_Array);
+        for length in length_Sample_Array:
+            word = "".join(random_State.choice(phoneme_List, size=length));
+            if not word in word_Set:
+                word_Set.add(word);
+                word_List.append(word);
+
+    return phoneme_List, word_List;
+
+def Measure(function, *args, **kwargs):
+    #The elapsed time and the peak memory allocated by Python and numpy during the call. The printed messages of TISK are discarded.
+    #'tracemalloc' slows every allocation, so the function is called twice: the time is taken without it, and the peak memory is taken in the second call. The result of the first call is returned.
+    with contextlib.redirect_stdout(io.StringIO()):
+        start_Time = time.perf_counter();
+        result = function(*args, **kwargs);
+        spent_Time = time.perf_counter() - start_Time;
+
+        tracemalloc.start();
+        tracemalloc.reset_peak();
+        function(*args, **kwargs);
+        peak_Memory = tracemalloc.get_traced_memory()[1];
+        tracemalloc.stop();
+
+    return result, {"Time": spent_Time, "Peak_Memory": peak_Memory};
+
+def Import_Time_Measure():
+    #Import 'Basic_TISK_Class' in a new interpreter, so the modules which are already imported here are not counted.
+    code = "import time; start_Time = time.perf_counter(); import Basic_TISK_Class; print(time.perf_counter() - start_Time)";
+    output = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.abspath(tisk.__file__)), capture_output=True, text=True, check=True).stdout;
+
+    return float(output.strip().split("\n")[-1]);
+
+def Unit_Count(tisk_Model):
+    return {
+        "Phoneme": tisk_Model.phoneme_Amount * tisk_Model.parameter_Dict["time_Slots"],
+        "Diphone": tisk_Model.diphone_Amount,
+        "Single_Phone": tisk_Model.phoneme_Amount,
+        "Word": tisk_Model.word_Amount
+        };
+
+def Connection_Count(tisk_Model):
+    #The nonzero weights of each connection matrix.
+    connection_Count_Dict = {};
+    for name in ["Phoneme_to_Diphone", "Phoneme_to_Single_Phone", "Diphone_to_Word", "Single_Phone_to_Word", "Word_to_Word", "Word_to_Diphone", "Word_to_Single_Phone"]:
+        weight_Matrix = getattr(tisk_Model, "weightMatrix_" + name);
+        if weight_Matrix is None:   #Not made with 'factorized_Diphone'
+            continue;
+        if hasattr(weight_Matrix, "tocsr"):
+            weight_Matrix = weight_Matrix.tocsr();
+            weight_Matrix.eliminate_zeros();
+            connection_Count_Dict[name] = int(weight_Matrix.nnz);
+        else:
+            connection_Count_Dict[name] = int(np.count_nonzero(weight_Matrix));
+
+    return connection_Count_Dict;
+
+def Benchmark(phoneme_Count, word_Count, length_Distribution = None, batch_Size_List = [1, 10, 100], run_List_Size = 200, sparse_Weight = False, dtype = "float64", seed = 0, prune_Diphone = False, factorized_Diphone = False):
+    """
+    Measure one lexicon.
+
+    Returns
+    -------
+    out : dict
+        The lexicon, the unit and connection counts, and the time (seconds) and peak memory (bytes) of 'Weight_Initialize', 'Run', 'Multi_Run' of each batch size, and 'Run_List'.
+
+    """
+    phoneme_List, word_List = Synthetic_Lexicon_Generate(phoneme_Count, word_Count, length_Distribution, seed);
+    random_State = np.random.RandomState(seed);
+    result_Dict = {
+        "Phoneme_Count": phoneme_Count,
+        "Word_Count": word_Count,
+        "Mean_Word_Length": float(np.mean([len(word) for word in word_List])),
+        "Sparse_Weight": sparse_Weight,
+        "Prune_Diphone": prune_Diphone,
+        "Factorized_Diphone": factorized_Diphone,
+        "Dtype": dtype,
+        "Seed": seed
+        };
+
+    tisk_Model, result_Dict["Construct"] = Measure(tisk.TISK_Model, phoneme_List, word_List, sparse_Weight=sparse_Weight, dtype=np.dtype(dtype), prune_Diphone=prune_Diphone, factorized_Diphone=factorized_Diphone);
+    _, result_Dict["Weight_Initialize"] = Measure(tisk_Model.Weight_Initialize);
+    result_Dict["Time_Slots"] = tisk_Model.parameter_Dict["time_Slots"];
+    result_Dict["Unit_Count"] = Unit_Count(tisk_Model);
+    result_Dict["Connection_Count"] = Connection_Count(tisk_Model);
+
+    _, result_Dict["Run"] = Measure(tisk_Model.Run, word_List[random_State.randint(len(word_List))]);
+
+    result_Dict["Multi_Run"] = [];
+    for batch_Size in batch_Size_List:
+        pronunciation_List = [word_List[index] for index in random_State.choice(len(word_List), size=min(batch_Size, len(word_List)), replace=False)];
+        _, measurement_Dict = Measure(tisk_Model.Multi_Run, pronunciation_List);
+        measurement_Dict["Batch_Size"] = len(pronunciation_List);
+        measurement_Dict["Time_per_Word"] = measurement_Dict["Time"] / len(pronunciation_List);
+        result_Dict["Multi_Run"].append(measurement_Dict);
+
+    pronunciation_List = [word_List[index] for index in random_State.choice(len(word_List), size=min(run_List_Size, len(word_List)), replace=False)];
+    _, result_Dict["Run_List"] = Measure(tisk_Model.Run_List, pronunciation_List, batch_Size=max(batch_Size_List));
+    result_Dict["Run_List"]["Word_Count"] = len(pronunciation_List);
+    result_Dict["Run_List"]["Time_per_Word"] = result_Dict["Run_List"]["Time"] / len(pronunciation_List);
+
+    return result_Dict;
+
+def Regression_Check(result_List, previous_Result_List, tolerance = 0.2):
+    #Compare the times of the same lexicons. Return the measurements which are slower than the previous result by more than 'tolerance'.
+    def Key(result_Dict):
+        return (result_Dict["Phoneme_Count"], result_Dict["Word_Count"], result_Dict["Mean_Word_Length"], result_Dict["Sparse_Weight"], result_Dict.get("Prune_Diphone", False), result_Dict.get("Factorized_Diphone", False), result_Dict["Dtype"], result_Dict["Seed"]);
+    def Time_Dict(result_Dict):
+        time_Dict = {name: result_Dict[name]["Time"] for name in ["Weight_Initialize", "Run", "Run_List"]};
+        for measurement_Dict in result_Dict["Multi_Run"]:
+            time_Dict["Multi_Run_" + str(measurement_Dict["Batch_Size"])] = measurement_Dict["Time"];
+        return time_Dict;
+
+    previous_Result_Dict = {Key(result_Dict): result_Dict for result_Dict in previous_Result_List};
+    regression_List = [];
+    for result_Dict in result_List:
+        if not Key(result_Dict) in previous_Result_Dict:
+            continue;
+        previous_Time_Dict = Time_Dict(previous_Result_Dict[Key(result_Dict)]);
+        for name, spent_Time in Time_Dict(result_Dict).items():
+            if name in previous_Time_Dict and spent_Time > previous_Time_Dict[name] * (1 + tolerance):
+                regression_List.append((result_Dict["Phoneme_Count"], result_Dict["Word_Count"], name, previous_Time_Dict[name], spent_Time));
+
+    return regression_List;
+
+def RT_Consistency_Check(tisk_Model, pronunciation_List, time_Acc_Criteria_List = None):
+    #'Parameter_Sweep' with the current parameters should report the same six values as 'Run_List'. Return the values which differ.
+    #The default criteria are 0, 1, 10, and one more than the cycles of a simulation, which take the different paths of the time-dependent RT.
+    if time_Acc_Criteria_List is None:
+        time_Acc_Criteria_List = [0, 1, 10, tisk_Model.parameter_Dict["time_Slots"] * tisk_Model.parameter_Dict["iStep"] + 1];
+    name_List = ["RT_Absolute", "ACC_Absolute", "RT_Relative", "ACC_Relative", "RT_Time_Dependent", "ACC_Time_Dependent"];
+
+    mismatch_List = [];
+    for time_Acc_Criteria in time_Acc_Criteria_List:
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_List_Result = tisk_Model.Run_List(pronunciation_List, time_Acc_Criteria=time_Acc_Criteria);
+            sweep_Result = tisk_Model.Parameter_Sweep([{}], pronunciation_List, time_Acc_Criteria=time_Acc_Criteria)[0];
+        for name, run_List_Value in zip(name_List, run_List_Result):
+            if not (run_List_Value == sweep_Result[name] or (np.isnan(run_List_Value) and np.isnan(sweep_Result[name]))):
+                mismatch_List.append((time_Acc_Criteria, name, run_List_Value, sweep_Result[name]));
+
+    return mismatch_List;
+
+if __name__ == "__main__":
+    argParser = argparse.ArgumentParser(description="Measure the time and memory of TISK with synthetic lexicons.");
+    argParser.add_argument("--word_Counts", type=int, nargs="+", default=[200, 1000, 5000], help="The lexicon sizes.");
+    argParser.add_argument("--phoneme_Counts", type=int, nargs="+", default=[14], help="The phoneme inventory sizes.");
+    argParser.add_argument("--length_Distribution", nargs="+", default=None, help="'length:frequency' pairs, for example '3:1 4:2'. The default is the distribution of the TRACE lexicon.");
+    argParser.add_argument("--batch_Sizes", type=int, nargs="+", default=[1, 10, 100], help="The batch sizes of 'Multi_Run'.");
+    argParser.add_argument("--run_List_Size", type=int, default=200, help="How many words are simulated by 'Run_List'.");
+    argParser.add_argument("--sparse_Weight", action="store_true", help="Use the sparse word connections.");
+    argParser.add_argument("--prune_Diphone", action="store_true", help="Keep only the diphones of the lexicon.");
+    argParser.add_argument("--factorized_Diphone", action="store_true", help="Compute the Phoneme -> Diphone input without its matrix.");
+    argParser.add_argument("--dtype", default="float64", help="'float64' or 'float32'.");
+    argParser.add_argument("--seed", type=int, default=0);
+    argParser.add_argument("--output", default="Benchmark_Result.json", help="The result file.");
+    argParser.add_argument("--compare", default=None, help="A previous result file. The measurements which became slower than 'tolerance' are reported, and the exit code becomes 1.");
+    argParser.add_argument("--tolerance", type=float, default=0.2);
+    argParser.add_argument("--check_RT", action="store_true", help="Check that 'Parameter_Sweep' and 'Run_List' report the same RTs with the smallest lexicon. A difference makes the exit code 1.");
+    argument_Dict = vars(argParser.parse_args());
+
+    length_Distribution = None;
+    if not argument_Dict["length_Distribution"] is None:
+        length_Distribution = {int(pair.split(":")[0]): float(pair.split(":")[1]) for pair in argument_Dict["length_Distribution"]};
+
+    output_Dict = {
+        "Environment": {
+            "Python": platform.python_version(),
+            "Numpy": np.__version__,
+            "Platform": platform.platform(),
+            "Processor": platform.processor(),
+            "CPU_Count": os.cpu_count(),
+            "Date": time.strftime("%Y-%m-%d %H:%M:%S")
+            },
+        "Import_Time": Import_Time_Measure(),
+        "Result": []
+        };
+    print("Import time: " + str(round(output_Dict["Import_Time"], 3)) + "s");
+
+    for phoneme_Count in argument_Dict["phoneme_Counts"]:
+        for word_Count in argument_Dict["word_Counts"]:
+            result_Dict = Benchmark(phoneme_Count, word_Count, length_Distribution, argument_Dict["batch_Sizes"], argument_Dict["run_List_Size"], argument_Dict["sparse_Weight"], argument_Dict["dtype"], argument_Dict["seed"], argument_Dict["prune_Diphone"], argument_Dict["factorized_Diphone"]);
+            output_Dict["Result"].append(result_Dict);
+            print("\t".join([
+                "Phonemes: " + str(phoneme_Count),
+                "Words: " + str(word_Count),
+                "Connections: " + str(sum(result_Dict["Connection_Count"].values())),
+                "Weight_Initialize: " + str(round(result_Dict["Weight_Initialize"]["Time"], 3)) + "s",
+                "Run: " + str(round(result_Dict["Run"]["Time"], 3)) + "s",
+                "Run_List: " + str(round(result_Dict["Run_List"]["Time_per_Word"], 4)) + "s/word",
+                "Peak memory: " + str(round(max(result_Dict["Weight_Initialize"]["Peak_Memory"], result_Dict["Run_List"]["Peak_Memory"]) / 1024 ** 2, 1)) + "MB"
+                ]));
+            with open(argument_Dict["output"], "w") as f:    #Saved after every lexicon, so a long benchmark keeps the finished results.
+                json.dump(output_Dict, f, indent=1);
+
+    if not argument_Dict["compare"] is None:
+        with open(argument_Dict["compare"]) as f:
+            regression_List = Regression_Check(output_Dict["Result"], json.load(f)["Result"], argument_Dict["tolerance"]);
+        for phoneme_Count, word_Count, name, previous_Time, spent_Time in regression_List:
+            print("Slower: phonemes " + str(phoneme_Count) + ", words " + str(word_Count) + ", " + name + ": " + str(round(previous_Time, 4)) + "s -> " + str(round(spent_Time, 4)) + "s");
+        if len(regression_List) > 0:
+            sys.exit(1);
+
+    if argument_Dict["check_RT"]:
+        phoneme_List, word_List = Synthetic_Lexicon_Generate(argument_Dict["phoneme_Counts"][0], min(argument_Dict["word_Counts"]), length_Distribution, argument_Dict["seed"]);
+        with contextlib.redirect_stdout(io.StringIO()):
+            tisk_Model = tisk.TISK_Model(phoneme_List, word_List, sparse_Weight=argument_Dict["sparse_Weight"], dtype=np.dtype(argument_Dict["dtype"]), prune_Diphone=argument_Dict["prune_Diphone"], factorized_Diphone=argument_Dict["factorized_Diphone"]);
+            tisk_Model.Weight_Initialize();
+        mismatch_List = RT_Consistency_Check(tisk_Model, word_List[:argument_Dict["run_List_Size"]]);
+        for time_Acc_Criteria, name, run_List_Value, sweep_Value in mismatch_List:
+            print("Different RT: time_Acc_Criteria " + str(time_Acc_Criteria) + ", " + name + ": Run_List " + str(run_List_Value) + ", Parameter_Sweep " + str(sweep_Value));
+        if len(mismatch_List) > 0:
+            sys.exit(1);